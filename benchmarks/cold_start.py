@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+sync_issues.py 콜드 스타트 시간 측정 (새 Python 프로세스 기준)
+
+사용 방법:
+    python benchmarks/cold_start.py            # 기본 20회 반복
+    python benchmarks/cold_start.py -n 50 --json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 측정 항목: (이름, 실행할 코드)
+SCENARIOS = [
+    ("python (기준)", "pass"),
+    ("import sync_issues", "import sync_issues"),
+    ("SyncEngine 생성", "import sync_issues as s; s.SyncEngine('key', 'db', github_token='token')"),
+    ("import + requests 로드", "import sync_issues as s; s.requests.Session"),
+    ("CLI --help", "import sys, sync_issues as s; sys.argv = ['sync_issues.py', '--help']; s.main()"),
+]
+
+
+def measure(code: str, runs: int) -> list:
+    """코드를 새 프로세스에서 runs번 실행하고 각 실행 시간(ms)을 반환합니다"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sync_issues.py 콜드 스타트 벤치마크")
+    parser.add_argument("-n", "--runs", type=int, default=20, help="항목별 반복 횟수 (기본값: 20)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in SCENARIOS:
+        timings = measure(code, args.runs)
+        results[name] = {
+            "median_ms": round(statistics.median(timings), 1),
+            "min_ms": round(min(timings), 1),
+            "max_ms": round(max(timings), 1),
+        }
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"콜드 스타트 ({args.runs}회, 새 프로세스 기준)")
+    for name, result in results.items():
+        print(f"  {name:<24} 중앙값 {result['median_ms']:>7.1f}ms  "
+              f"(최소 {result['min_ms']:.1f} / 최대 {result['max_ms']:.1f})")
+
+
+if __name__ == "__main__":
+    main()
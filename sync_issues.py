@@ -3,87 +3,51 @@
 GitHub Issues를 Notion 데이터베이스로 동기화하는 스크립트
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import re
 import json
-import yaml
-import requests
+import time
+import zlib
+import hashlib
+import argparse
+import colorsys
+import fnmatch
+import importlib
+import queue
+import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterable, Tuple, Union
 from pathlib import Path
 
 
-class GitHubNotionSync:
-    def __init__(self, repo: str, notion_api_key: str, notion_database_id: str):
-        self.repo = repo  # format: "owner/repo"
-        self.notion_api_key = notion_api_key
-        self.notion_database_id = notion_database_id
-        self.github_token = os.environ.get('GITHUB_TOKEN')
-        
-        self.notion_headers = {
-            "Authorization": f"Bearer {self.notion_api_key}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
-        }
-        
-        self.github_headers = {
-            "Accept": "application/vnd.github.v3+json"
-        }
-        if self.github_token:
-            self.github_headers["Authorization"] = f"token {self.github_token}"
+class _LazyModule:
+    """처음 사용할 때 import되는 모듈 (CLI/서버리스 콜드 스타트 시간 단축용)"""
 
-    def get_github_issues(self) -> List[Dict]:
-        """GitHub Issues를 가져옵니다"""
-        url = f"https://api.github.com/repos/{self.repo}/issues"
-        params = {
-            "state": "all",  # open, closed, all
-            "per_page": 100
-        }
-        
-        try:
-            response = requests.get(url, headers=self.github_headers, params=params)
-            response.raise_for_status()
-            issues = response.json()
-            
-            # Pull Requests 제외 (Issues API가 PR도 포함함)
-            issues = [issue for issue in issues if 'pull_request' not in issue]
-            
-            print(f"✓ GitHub에서 {len(issues)}개의 이슈를 가져왔습니다.")
-            return issues
-        except requests.exceptions.RequestException as e:
-            print(f"✗ GitHub API 호출 실패: {e}")
-            sys.exit(1)
+    def __init__(self, name: str):
+        self._name = name
 
-    def get_issue_projects_info(self, issue: Dict) -> Dict[str, Any]:
-        """GraphQL로 이슈의 Projects V2 정보를 가져옵니다 (모든 레벨 포함)"""
-        issue_number = issue['number']
-        node_id = issue.get('node_id')  # Issue의 global node ID
-        
-        if not node_id:
-            print(f"  ⚠ Issue #{issue_number}: node_id 없음")
-            return {}
-        
-        # GraphQL 쿼리 - node_id를 사용하여 모든 레벨의 Projects 조회
-        query = """
-        query($nodeId: ID!) {
-          node(id: $nodeId) {
-            ... on Issue {
-              projectItems(first: 10) {
-                nodes {
-                  project {
-                    title
-                    number
-                    owner {
-                      ... on User {
-                        login
-                      }
-                      ... on Organization {
-                        login
-                      }
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self._name)
+        globals()[self._name] = module  # 이후에는 실제 모듈을 바로 사용
+        return getattr(module, attr)
+
+
+# requests/yaml은 import 비용이 크므로 실제로 API를 호출하거나 설정을 읽을 때 로드
+requests = _LazyModule("requests")
+yaml = _LazyModule("yaml")
+
+
+# Projects V2 필드 값 선택 (이슈 조회와 필드 값 추가 페이지 조회 공용)
+PROJECT_FIELD_VALUES_SELECTION = """
+                    totalCount
+                    pageInfo {
+                      hasNextPage
+                      endCursor
                     }
-                  }
-                  fieldValues(first: 20) {
                     nodes {
                       ... on ProjectV2ItemFieldSingleSelectValue {
                         name
@@ -118,10 +82,7 @@ class GitHubNotionSync:
                         }
                       }
                       ... on ProjectV2ItemFieldDateValue {
-                        date {
-                          start
-                          end
-                        }
+                        date
                         field {
                           ... on ProjectV2Field {
                             name
@@ -129,20 +90,1706 @@ class GitHubNotionSync:
                         }
                       }
                     }
+"""
+
+# Projects V2 조회용 GraphQL 선택 필드 (단건/배치 쿼리 공용)
+# first 값이 쿼리 비용을 결정하므로 호출하는 쪽에서 채움 (items_first, fields_first)
+PROJECT_ITEMS_SELECTION = """
+              projectItems(first: %(items_first)d) {
+                nodes {
+                  id
+                  project {
+                    title
+                    number
+                    owner {
+                      ... on User {
+                        login
+                      }
+                      ... on Organization {
+                        login
+                      }
+                    }
+                  }
+                  fieldValues(first: %(fields_first)d) {
+%(field_values)s
                   }
                 }
               }
-            }
+"""
+
+# 쿼리 비용과 남은 한도 (GraphQL 쿼리에 함께 요청해 GraphQLBudget에 반영)
+RATE_LIMIT_SELECTION = """
+          rateLimit {
+            cost
+            remaining
+            resetAt
+            limit
           }
+"""
+
+# poll 모드 기본 설정 (config.yml의 poll 항목으로 덮어쓸 수 있음, 간격 단위: 초)
+DEFAULT_POLL_CONFIG = {
+    "min_interval": 15,    # 변경이 있으면 이 간격으로 다시 확인
+    "max_interval": 300,   # 변경이 없으면 1.5배씩 늘려 이 간격까지
+    "projects": True,      # 레포에 연결된 Projects의 아이템 변경도 확인 (GraphQL)
+}
+
+# 코멘트 섹션 헤딩 (페이지 본문을 다시 만들 때 이 블록과 하위 코멘트는 유지)
+COMMENTS_HEADING = "💬 Comments"
+
+# 이미지/첨부 파일만 있는 본문 줄 (Notion 이미지/파일 블록으로 변환)
+MARKDOWN_IMAGE_LINE = re.compile(r'^\s*!\[([^\]]*)\]\((\S+?)(?:\s+"[^"]*")?\)\s*$')
+HTML_IMAGE_LINE = re.compile(r'^\s*<img\b[^>]*?\bsrc=["\']([^"\']+)["\'][^>]*>\s*$', re.IGNORECASE)
+HTML_ALT = re.compile(r'\balt=["\']([^"\']*)["\']', re.IGNORECASE)
+MARKDOWN_LINK_LINE = re.compile(r'^\s*\[([^\]]+)\]\((\S+?)\)\s*$')
+BARE_URL_LINE = re.compile(r'^\s*(https://\S+)\s*$')
+
+# GitHub에 업로드된 이미지/첨부 파일 (비공개 레포는 인증이 필요해 Notion이 직접 불러올 수 없으므로 미러링)
+GITHUB_ASSET_URL = re.compile(
+    r'^https://(?:(?:private-)?user-images\.githubusercontent\.com/'
+    r'|github\.com/user-attachments/(?:assets|files)/'
+    r'|github\.com/[^/\s]+/[^/\s]+/(?:assets|files)/)'
+)
+
+# 기본 필드 매핑: GitHub 이슈/Projects 필드 → Notion 속성
+# config.yml의 field_mappings로 속성별로 덮어쓰거나(같은 property), 새 속성을 추가할 수 있음
+# - source: 이슈 필드 이름, "project"(프로젝트 이름), "project.<필드 이름>"(대소문자 무시), 또는 후보 목록
+# - type: title, rich_text, number, select, multi_select, date, url, checkbox
+# - values: 값 치환 (예: open → Open), default: 값이 없을 때 쓸 값, on_update: false면 생성 시에만 씀
+DEFAULT_FIELD_MAPPINGS = [
+    {"property": "Title", "type": "title", "source": "title"},
+    {"property": "Issue Number", "type": "number", "source": "number", "on_update": False},
+    {"property": "Status", "type": "select", "source": "state", "values": {"open": "Open", "closed": "Closed"}},
+    {"property": "Labels", "type": "multi_select", "source": "labels", "default": []},
+    {"property": "URL", "type": "url", "source": "html_url"},
+    {"property": "Created At", "type": "date", "source": "created_at", "on_update": False},
+    {"property": "Assignee", "type": "rich_text", "source": "assignee"},
+    {"property": "Assignees", "type": "people", "source": "assignees", "default": []},
+    {"property": "Milestone", "type": "rich_text", "source": "milestone"},
+    {"property": "Repository", "type": "rich_text", "source": "repository"},
+    {"property": "Project", "type": "rich_text", "source": "project"},
+    {"property": "Project Status", "type": "select", "source": "project.Status"},
+    {"property": "Priority", "type": "select", "source": "project.Priority"},
+    {"property": "Size", "type": "select", "source": "project.Size"},
+    {"property": "Story Points", "type": "number", "source": "project.Story Points"},
+    {"property": "Capacity", "type": "number", "source": "project.Capacity"},
+    {"property": "Sprint", "type": "rich_text", "source": ["project.Sprint", "project.Iteration"]},
+    {"property": "Start date", "type": "date", "source": "project.Start date"},
+    {"property": "Target date", "type": "date", "source": "project.Target date"},
+    {"property": "Due date", "type": "date", "source": "project.Due date"},
+]
+
+# 라벨이 없는 이슈를 Text 속성에 쓸 때의 값 (Labels를 Text로 만든 기존 데이터베이스)
+NO_LABELS_TEXT = "없음"
+
+# GitHub 라벨 색 → Notion select 색 (색상환 구간별, 채도가 낮으면 gray/default)
+NOTION_HUE_COLORS = [(15, "red"), (40, "orange"), (70, "yellow"), (170, "green"),
+                     (250, "blue"), (300, "purple"), (345, "pink"), (360, "red")]
+
+# Notion → GitHub 역방향 동기화가 가능한 source (그 외 source는 GitHub에 쓸 수 없음)
+REVERSIBLE_SOURCES = ("state", "labels")
+
+# 파이프라인 기본 설정 (config.yml의 pipeline 항목으로 덮어쓸 수 있음)
+DEFAULT_PIPELINE_CONFIG = {
+    "fetch_workers": 4,        # GitHub 이슈 페이지 병렬 조회 수
+    "enrich_workers": 2,       # Projects GraphQL 조회 워커 수
+    "enrich_batch_size": 20,   # GraphQL 한 번에 조회할 이슈 수
+    "asset_workers": 4,        # 첨부 파일 미러링(다운로드/업로드) 워커 수
+    "convert_workers": 2,      # Markdown → Notion 블록 변환 워커 수
+    "write_workers": 3,        # Notion 쓰기 워커 수
+    "queue_size": 50,          # 단계 사이 큐 최대 깊이 (backpressure)
+    "notion_rate_limit": 3.0,  # Notion API 초당 요청 수 (공식 평균 제한: 3 req/s)
+    "graphql_reserve": 100,    # 남겨둘 GitHub GraphQL 포인트 (이 아래로 내려가면 리셋까지 대기)
+    "graphql_max_query_cost": 10,  # 쿼리 하나의 최대 예상 비용 (배치 크기를 이에 맞춰 줄임)
+}
+
+
+@dataclass(slots=True)
+class Issue:
+    """동기화에 필요한 필드만 담은 이슈 레코드 (GitHub REST 응답 전체를 들고 다니지 않음)"""
+    repository: str
+    number: int
+    title: str
+    state: str
+    html_url: str
+    created_at: str
+    updated_at: str
+    node_id: Optional[str]
+    body: str
+    labels: Tuple[str, ...]
+    assignee: Optional[str]
+    assignees: Tuple[str, ...]
+    milestone: Optional[str]
+    milestone_id: Optional[int] = None  # 마일스톤 데이터베이스 relation용 (GitHub 마일스톤 ID)
+    projects: Optional[Dict[str, Any]] = None  # enrich 단계에서 채워지는 Projects V2 정보
+
+    @classmethod
+    def from_github(cls, data: Dict, repository: str) -> "Issue":
+        """GitHub REST 이슈 응답에서 필요한 필드만 추려 만듭니다"""
+        intern = sys.intern  # 라벨/상태/사용자 이름은 이슈 간에 반복되므로 문자열 공유
+        assignee = data.get("assignee")
+        milestone = data.get("milestone")
+        return cls(
+            repository=repository,
+            number=data["number"],
+            title=data["title"],
+            state=intern(data["state"]),
+            html_url=data["html_url"],
+            created_at=data["created_at"],
+            updated_at=data.get("updated_at") or data["created_at"],
+            node_id=data.get("node_id"),
+            body=data.get("body") or "",
+            labels=tuple(intern(label["name"]) for label in data.get("labels") or []),
+            assignee=intern(assignee["login"]) if assignee else None,
+            assignees=tuple(intern(user["login"]) for user in data.get("assignees") or []),
+            milestone=milestone["title"] if milestone else None,
+            milestone_id=milestone["id"] if milestone else None,
+        )
+
+
+def find_notion_property(properties: Dict[str, Any], name: str) -> Optional[Any]:
+    """속성 이름으로 값을 찾습니다 (정확히 같은 이름이 없으면 대소문자 무시, 예: "Start date" ↔ "Start Date")"""
+    if name in properties:
+        return properties[name]
+    folded = name.lower()
+    return next((value for key, value in properties.items() if key.lower() == folded), None)
+
+
+def read_notion_property(prop: Optional[Dict]) -> Any:
+    """Notion 속성 값을 단순 값으로 읽습니다 (select → 이름, rich_text → 문자열 등)"""
+    if not prop:
+        return None
+    kind = prop.get("type") or next((key for key in prop if key != "id"), None)
+    value = prop.get(kind)
+    if kind in ("title", "rich_text"):
+        return "".join(part.get("plain_text") or part.get("text", {}).get("content", "")
+                       for part in value or [])
+    if kind == "select":
+        return value["name"] if value else None
+    if kind == "multi_select":
+        return sorted(option["name"] for option in value or [])
+    if kind == "date":
+        return value.get("start") if value else None
+    return value
+
+
+def notion_color(hex_color: Optional[str]) -> str:
+    """GitHub 라벨 색(예: "d73a4a")을 가장 가까운 Notion 옵션 색으로 바꿉니다"""
+    try:
+        red, green, blue = (int(hex_color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    except (TypeError, ValueError):
+        return "default"
+    hue, saturation, value = colorsys.rgb_to_hsv(red, green, blue)
+    if saturation < 0.2:
+        return "default" if value > 0.85 else "gray"
+    degrees = hue * 360
+    color = next(name for limit, name in NOTION_HUE_COLORS if degrees < limit)
+    if color in ("red", "orange", "yellow") and value < 0.55:
+        return "brown"
+    return color
+
+
+def option_name(value: Any) -> str:
+    """Notion select 옵션 이름 (쉼표 불가, 최대 100자)"""
+    return str(value).replace(",", " ")[:100]
+
+
+def _text_value(value: Any) -> str:
+    """목록은 쉼표로 이어 붙인 문자열로 변환합니다"""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Notion 속성 타입별 값 변환 (값 → 속성 payload, 변환할 수 없으면 None)
+NOTION_COERCERS: Dict[str, Callable[[Any], Optional[Dict]]] = {
+    "title": lambda v: {"title": [{"text": {"content": _text_value(v)[:2000]}}]},
+    "rich_text": lambda v: {"rich_text": [{"text": {"content": _text_value(v)[:2000]}}]},
+    "number": lambda v: {"number": _to_number(v)} if _to_number(v) is not None else None,
+    "select": lambda v: {"select": {"name": option_name(_text_value(v))}},
+    "multi_select": lambda v: {"multi_select": [
+        {"name": option_name(name).strip()}
+        for name in (v if isinstance(v, (list, tuple)) else str(v).split(",")) if str(name).strip()
+    ]},
+    "date": lambda v: {"date": {"start": str(v)}},
+    "url": lambda v: {"url": str(v)},
+    "checkbox": lambda v: {"checkbox": bool(v)},
+    # people: 값은 Notion 사용자 ID 목록 (FieldMapper.build가 PeopleDirectory로 GitHub 로그인을 바꿔서 넘김)
+    "people": lambda v: {"people": [{"object": "user", "id": user_id} for user_id in v]},
+}
+
+
+class FieldMapper:
+    """config.yml의 필드 매핑을 한 번 컴파일해 create/update가 함께 쓰는 속성 payload 빌더
+
+    매핑마다 (값 추출 함수, 변환 함수)를 미리 만들어 두므로 이슈마다 필드 이름 분기나
+    Projects 필드 이름 비교를 반복하지 않습니다.
+    """
+
+    def __init__(self, mappings: List[Dict[str, Any]]):
+        self.mappings = mappings
+        self.uses_projects = any(
+            source == "project" or source.startswith("project.")
+            for mapping in mappings for source in self._sources(mapping)
+        )
+        # (property, type, 추출 함수, 변환 함수, 생성 시에만 사용)
+        self._compiled = [
+            (mapping["property"], mapping["type"], self._compile_getter(mapping),
+             NOTION_COERCERS[mapping["type"]], mapping.get("on_update", True) is False)
+            for mapping in mappings
+        ]
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "FieldMapper":
+        """기본 매핑에 config.yml의 field_mappings를 합쳐 컴파일합니다"""
+        mappings = {mapping["property"]: dict(mapping) for mapping in DEFAULT_FIELD_MAPPINGS}
+        for mapping in (config or {}).get('field_mappings') or []:
+            name = mapping.get("property")
+            if not name:
+                print(f"⚠ field_mappings 항목에 property가 없습니다: {mapping}")
+                continue
+            if mapping.get("enabled", True) is False:
+                mappings.pop(name, None)
+                continue
+            merged = dict(mappings.get(name, {}), **mapping)
+            if merged.get("type") not in NOTION_COERCERS or not merged.get("source"):
+                print(f"⚠ field_mappings '{name}': 지원하지 않는 type 또는 source 없음 - 건너뜁니다")
+                continue
+            mappings[name] = merged
+        return cls(list(mappings.values()))
+
+    @staticmethod
+    def _sources(mapping: Dict) -> List[str]:
+        source = mapping.get("source")
+        return list(source) if isinstance(source, (list, tuple)) else [source]
+
+    def _compile_getter(self, mapping: Dict) -> Callable[[Issue, Dict[str, Any]], Any]:
+        """매핑의 source 목록을 이슈에서 값을 꺼내는 함수 하나로 만듭니다"""
+        getters = []
+        for source in self._sources(mapping):
+            if source == "project":
+                getters.append(lambda issue, fields: (issue.projects or {}).get("project_title") or None)
+            elif source.startswith("project."):
+                key = source[len("project."):].strip().lower()
+                getters.append(lambda issue, fields, key=key: fields.get(key))
+            elif source in Issue.__dataclass_fields__:
+                getters.append(lambda issue, fields, attr=source: getattr(issue, attr))
+            else:
+                print(f"⚠ field_mappings '{mapping['property']}': 알 수 없는 source '{source}'")
+
+        values = mapping.get("values") or {}
+        default = mapping.get("default")
+
+        def get(issue: Issue, fields: Dict[str, Any]) -> Any:
+            for getter in getters:
+                value = getter(issue, fields)
+                if value is not None and value != () and value != "":
+                    return values.get(value, value) if values and isinstance(value, str) else value
+            return default
+
+        return get
+
+    def build(self, issue: Issue, for_update: bool = False,
+              people: Optional["PeopleDirectory"] = None) -> Dict[str, Dict]:
+        """이슈 하나의 Notion 속성 payload를 만듭니다 (people 속성은 사용자 디렉터리가 있을 때만)"""
+        project_fields = (issue.projects or {}).get("fields") or {}
+        fields = {name.lower(): value for name, value in project_fields.items()}
+
+        properties = {}
+        for name, kind, get, coerce, create_only in self._compiled:
+            if for_update and create_only:
+                continue
+            value = get(issue, fields)
+            if value is None:
+                continue
+            if kind == "people":
+                if people is None or not people.loaded:
+                    continue  # 디렉터리를 못 불러왔으면 기존 값을 지우지 않도록 건너뜀
+                value = people.resolve(value if isinstance(value, (list, tuple)) else [value])
+            payload = coerce(value)
+            if payload is not None:
+                properties[name] = payload
+        return properties
+
+    def people_properties(self) -> List[str]:
+        """Notion people 속성 이름 목록 (있으면 사용자 디렉터리를 불러옴)"""
+        return [mapping["property"] for mapping in self.mappings if mapping["type"] == "people"]
+
+    def label_properties(self) -> List[str]:
+        """GitHub 라벨을 쓰는 속성 이름 목록 (multi_select 옵션 캐시 대상)"""
+        return [mapping["property"] for mapping in self.mappings if self._sources(mapping)[0] == "labels"]
+
+    def reverse_targets(self) -> Dict[str, str]:
+        """역방향 동기화가 가능한 속성 → GitHub 대상 ("state", "labels", "project:<필드>")"""
+        targets = {}
+        for mapping in self.mappings:
+            source = self._sources(mapping)[0]
+            if source in REVERSIBLE_SOURCES:
+                targets[mapping["property"]] = source
+            elif source.startswith("project."):
+                targets[mapping["property"]] = "project:" + source[len("project."):]
+        return targets
+
+    def to_github_value(self, name: str, value: Any) -> Any:
+        """Notion 속성 값을 GitHub 쪽 값으로 되돌립니다 (values 치환과 default의 역변환)"""
+        mapping = next(m for m in self.mappings if m["property"] == name)
+        source = self._sources(mapping)[0]
+        if value == mapping.get("default"):
+            value = None
+        reverse_values = {v: k for k, v in (mapping.get("values") or {}).items()}
+        if isinstance(value, str) and value in reverse_values:
+            return reverse_values[value]
+        if source == "labels":
+            if isinstance(value, list):
+                return value
+            if value == NO_LABELS_TEXT:
+                return []
+            return [label.strip() for label in (value or "").split(",") if label.strip()]
+        return value
+
+
+class NotionDatabase:
+    """동기화 대상 Notion 데이터베이스 하나의 캐시 (스키마, 레포별 페이지 인덱스)
+
+    같은 데이터베이스로 가는 레포들은 DatabaseRouter를 통해 하나를 공유합니다.
+    """
+
+    def __init__(self, database_id: str, name: Optional[str] = None):
+        self.id = database_id
+        self.name = name or database_id[:8]
+        self.schema: Optional[Dict[str, str]] = None  # 속성 이름 → 타입 (조회 전이거나 실패하면 None)
+        self.options: Dict[str, Dict[str, Dict]] = {}  # select/multi_select 속성 → {옵션 이름: 옵션}
+        self._folded_names: Dict[str, str] = {}  # 소문자 속성 이름 → 스키마의 속성 이름
+        self.pages: Dict[str, Dict[int, str]] = {}  # 레포 → {이슈 번호: page_id} (불러온 레포만)
+        self.lock = threading.Lock()
+        self.schema_lock = threading.Lock()
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._warned: set = set()
+
+    def repo_lock(self, repo: str) -> threading.Lock:
+        """레포 인덱스를 한 번만 불러오도록 쓰는 잠금"""
+        with self.lock:
+            return self._repo_locks.setdefault(repo, threading.Lock())
+
+    def indexed(self, repo: str) -> bool:
+        return repo in self.pages
+
+    def lookup(self, repo: str, number: int) -> Optional[str]:
+        with self.lock:
+            return self.pages.get(repo, {}).get(number)
+
+    def remember(self, repo: str, number: int, page_id: str):
+        """새로 만든 페이지를 인덱스에 추가합니다 (인덱스를 불러온 레포만)"""
+        with self.lock:
+            if repo in self.pages:
+                self.pages[repo][number] = page_id
+
+    def forget(self, repo: str, number: Optional[int] = None):
+        """페이지 하나 또는 레포 인덱스 전체를 버립니다"""
+        with self.lock:
+            if number is None:
+                self.pages.pop(repo, None)
+            elif repo in self.pages:
+                self.pages[repo].pop(number, None)
+
+    def set_schema(self, properties: Dict[str, Dict]):
+        """데이터베이스 조회/수정 응답의 properties로 스키마와 옵션 캐시를 채웁니다"""
+        self.schema = {name: prop.get("type") for name, prop in properties.items()}
+        self._folded_names = {name.lower(): name for name in self.schema}
+        self.options = {
+            name: {option["name"]: option for option in (prop.get(prop.get("type")) or {}).get("options", [])}
+            for name, prop in properties.items() if prop.get("type") in ("select", "multi_select")
         }
+
+    def property_name(self, name: str) -> Optional[str]:
+        """스키마에서 쓰는 속성 이름 (대소문자만 다르면 데이터베이스 쪽 이름, 없으면 None)"""
+        if self.schema is None or name in self.schema:
+            return name
+        return self._folded_names.get(name.lower())
+
+    def filter_properties(self, properties: Dict[str, Dict]) -> Dict[str, Dict]:
+        """스키마에 맞게 속성을 고칩니다
+
+        스키마에 없는 속성은 빼고 (팀마다 데이터베이스 속성 구성이 다를 수 있음), 대소문자만 다른 이름
+        ("Due date" ↔ "Due Date")은 데이터베이스 쪽 이름으로 씁니다.
+        multi_select ↔ rich_text는 데이터베이스 쪽 타입으로 바꿔 씁니다 (Labels를 Text로 만든 기존 데이터베이스).
         """
+        if self.schema is None:
+            return properties
+        fitted = {}
+        for name, payload in properties.items():
+            name = self.property_name(name) or name
+            kind = self.schema.get(name)
+            if kind is None:
+                if name not in self._warned:
+                    self._warned.add(name)
+                    print(f"⚠ Notion 데이터베이스 '{self.name}'에 '{name}' 속성이 없어 건너뜁니다")
+                continue
+            if kind == "rich_text" and "multi_select" in payload:
+                text = ", ".join(option["name"] for option in payload["multi_select"]) or NO_LABELS_TEXT
+                payload = {"rich_text": [{"text": {"content": text[:2000]}}]}
+            elif kind == "multi_select" and "rich_text" in payload:
+                payload = NOTION_COERCERS["multi_select"](
+                    "".join(part["text"]["content"] for part in payload["rich_text"]))
+            fitted[name] = payload
+        return fitted
+
+
+class DatabaseRouter:
+    """config.yml의 databases 규칙으로 이슈마다 대상 Notion 데이터베이스를 고릅니다
+
+    규칙은 위에서부터 확인해 처음 맞는 것을 쓰고, 맞는 규칙이 없으면 기본 데이터베이스
+    (NOTION_DATABASE_ID)로 보냅니다. 한 규칙의 repos/labels/projects 조건은 모두 맞아야 하고,
+    각 조건은 목록 중 하나만 맞으면 됩니다.
+    """
+
+    def __init__(self, default: NotionDatabase, rules: Optional[List[Dict[str, Any]]] = None,
+                 milestones: Optional[NotionDatabase] = None, milestone_property: str = "Milestones"):
+        self.default = default
+        self.rules = rules or []
+        # 마일스톤 데이터베이스 (config.yml의 milestones, 이슈 페이지는 milestone_property relation으로 연결)
+        self.milestones = milestones
+        self.milestone_property = milestone_property
+        self.databases: Dict[str, NotionDatabase] = {default.id: default}
+        for rule in self.rules:
+            self.databases.setdefault(rule["database"].id, rule["database"])
+        self.uses_projects = any(rule["projects"] for rule in self.rules)
+
+    @classmethod
+    def from_config(cls, default_id: str, config: Optional[Dict]) -> "DatabaseRouter":
+        """기본 데이터베이스 ID와 config.yml의 databases 목록으로 라우터를 만듭니다"""
+        databases = {default_id: NotionDatabase(default_id, "default")}
+        rules = []
+        for entry in (config or {}).get('databases') or []:
+            database_id = cls._database_id(entry)
+            if not database_id:
+                print(f"⚠ databases 항목에 database(또는 database_env 값)가 없습니다: {entry}")
+                continue
+            database = databases.setdefault(database_id, NotionDatabase(database_id, entry.get("name")))
+            rules.append({
+                "database": database,
+                "repos": cls._patterns(entry.get("repos")),
+                "labels": [label.lower() for label in cls._patterns(entry.get("labels"))],
+                "projects": cls._patterns(entry.get("projects")),
+            })
+        milestones_config = (config or {}).get('milestones') or {}
+        milestones = None
+        if milestones_config:
+            milestones_id = cls._database_id(milestones_config)
+            if milestones_id:
+                milestones = NotionDatabase(milestones_id, "milestones")
+            else:
+                print("⚠ milestones에 database(또는 database_env 값)가 없어 마일스톤 동기화를 건너뜁니다")
+        return cls(databases[default_id], rules, milestones,
+                   milestones_config.get('relation_property') or "Milestones")
+
+    @staticmethod
+    def _database_id(entry: Dict[str, Any]) -> str:
+        return entry.get("database") or os.environ.get(entry.get("database_env") or "", "")
+
+    @staticmethod
+    def _patterns(value: Any) -> List[str]:
+        if not value:
+            return []
+        return [str(item) for item in value] if isinstance(value, (list, tuple)) else [str(value)]
+
+    @staticmethod
+    def _repo_matches(rule: Dict[str, Any], repo: str) -> bool:
+        return not rule["repos"] or any(fnmatch.fnmatch(repo, pattern) for pattern in rule["repos"])
+
+    def route(self, issue: Issue) -> NotionDatabase:
+        """이슈를 보낼 데이터베이스 (Projects 규칙은 issue.projects가 채워져 있어야 함)"""
+        labels = {label.lower() for label in issue.labels}
+        project = (issue.projects or {}).get("project_title")
+        for rule in self.rules:
+            if not self._repo_matches(rule, issue.repository):
+                continue
+            if rule["labels"] and not labels.intersection(rule["labels"]):
+                continue
+            if rule["projects"] and project not in rule["projects"]:
+                continue
+            return rule["database"]
+        return self.default
+
+    def candidates(self, repo: str) -> List[NotionDatabase]:
+        """레포의 이슈가 들어갈 수 있는 데이터베이스 목록 (페이지 검색/역방향 동기화용)"""
+        result: List[NotionDatabase] = []
+        for rule in self.rules:
+            if not self._repo_matches(rule, repo):
+                continue
+            if rule["database"] not in result:
+                result.append(rule["database"])
+            if not rule["labels"] and not rule["projects"]:
+                return result  # 레포 전체가 이 규칙에 걸리므로 뒤 규칙/기본 데이터베이스로는 가지 않음
+        if self.default not in result:
+            result.append(self.default)
+        return result
+
+
+class PeopleDirectory:
+    """GitHub 로그인 → Notion 사용자 ID 디렉터리
+
+    Notion 사용자 목록(GET /v1/users)을 실행당 최대 한 번 조회해 상태 파일에 TTL과 함께 캐시하고,
+    이슈마다 사용자를 조회하지 않고 메모리에서만 찾습니다. 찾는 순서:
+    config.yml의 people.map (이메일, Notion 사용자 ID 또는 이름) → Notion 이름 → 이메일 앞부분.
+    """
+
+    def __init__(self, state: SyncState, overrides: Optional[Dict[str, str]] = None, ttl_hours: float = 24):
+        self.state = state
+        self.overrides = {login.lower(): str(target) for login, target in (overrides or {}).items()}
+        self.ttl = float(ttl_hours) * 3600
+        self.loaded = False
+        self._fetched_at = 0.0
+        self._by_key: Dict[str, str] = {}  # 이메일/이름/ID(소문자) → 사용자 ID
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._warned: set = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, state: SyncState, config: Optional[Dict]) -> "PeopleDirectory":
+        people_config = (config or {}).get('people') or {}
+        return cls(state, people_config.get('map'), people_config.get('cache_ttl_hours', 24))
+
+    @property
+    def fresh(self) -> bool:
+        """불러온 목록이 TTL 안인지 (오래 실행되는 SyncEngine은 TTL이 지나면 다시 조회)"""
+        return self.loaded and time.time() - self._fetched_at < self.ttl
+
+    def load(self, fetch_users: Callable[[], List[Dict]]) -> bool:
+        """캐시가 TTL 안이면 그대로 쓰고, 아니면 fetch_users로 다시 조회합니다 (실패하면 오래된 캐시라도 사용)"""
+        if self.fresh:
+            return True
+        with self._lock:
+            if self.fresh:
+                return True
+            with self.state.lock:
+                cache = dict(self.state.section("people"))
+            if cache.get("users") is None or time.time() - cache.get("fetched_at", 0) >= self.ttl:
+                try:
+                    users = [{"id": user["id"], "name": user.get("name") or "",
+                              "email": (user.get("person") or {}).get("email") or ""}
+                             for user in fetch_users() if user.get("type") == "person"]
+                    cache = {"fetched_at": time.time(), "users": users}
+                    with self.state.lock:
+                        self.state.section("people").update(cache)
+                except requests.exceptions.RequestException as e:
+                    print(f"⚠ Notion 사용자 목록 조회 실패: {e}")
+                    if cache.get("users") is None:
+                        return False
+                    cache["fetched_at"] = time.time()  # 이번 실행에서는 다시 시도하지 않음
+            self._index(cache["users"])
+            self._fetched_at = cache["fetched_at"]
+            self.loaded = True
+            return True
+
+    def _index(self, users: List[Dict]):
+        self._by_key, self._resolved = {}, {}
+        for user in users:
+            for key in (user["id"], user["name"], user["email"]):
+                if key:
+                    self._by_key.setdefault(key.lower(), user["id"])
+            local = user["email"].split("@", 1)[0].lower()
+            if local:
+                self._by_key.setdefault("@" + local, user["id"])
+            name = user["name"].replace(" ", "").lower()
+            if name:
+                self._by_key.setdefault(name, user["id"])
+
+    def lookup(self, login: str) -> Optional[str]:
+        """GitHub 로그인 하나를 Notion 사용자 ID로 바꿉니다 (메모이즈, 못 찾으면 한 번만 경고)"""
+        key = login.lower()
+        if key not in self._resolved:
+            target = self.overrides.get(key)
+            if target:
+                user_id = self._by_key.get(target.lower())
+            else:
+                user_id = self._by_key.get(key) or self._by_key.get("@" + key)
+            self._resolved[key] = user_id
+            if user_id is None and key not in self._warned:
+                self._warned.add(key)
+                print(f"⚠ GitHub 사용자 '{login}'에 맞는 Notion 사용자가 없습니다 (config.yml의 people.map)")
+        return self._resolved[key]
+
+    def resolve(self, logins: Iterable[str]) -> List[str]:
+        user_ids = []
+        for login in logins:
+            user_id = self.lookup(str(login))
+            if user_id and user_id not in user_ids:
+                user_ids.append(user_id)
+        return user_ids
+
+
+@dataclass(slots=True)
+class Comment:
+    """동기화에 필요한 필드만 담은 이슈 코멘트 레코드"""
+    id: int
+    issue_number: int
+    author: str
+    created_at: str
+    updated_at: str
+    body: str
+
+    @classmethod
+    def from_github(cls, data: Dict) -> "Comment":
+        """GitHub REST 코멘트 응답에서 필요한 필드만 추려 만듭니다"""
+        user = data.get("user") or {}
+        return cls(
+            id=data["id"],
+            issue_number=int(data["issue_url"].rsplit("/", 1)[-1]),
+            author=sys.intern(user.get("login", "ghost")),
+            created_at=data["created_at"],
+            updated_at=data.get("updated_at") or data["created_at"],
+            body=data.get("body") or "",
+        )
+
+
+class SyncState:
+    """실행 간에 유지되는 동기화 상태 (JSON 파일, Actions cache로 보존)"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.lock = threading.RLock()
+        self.data: Dict[str, Any] = {}
+        if path and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠ 동기화 상태 파일 로드 실패 ({path}): {e}")
+                print("빈 상태로 시작합니다...")
+
+    def section(self, name: str) -> Dict[str, Any]:
+        """이름별 상태 영역을 반환합니다 (없으면 생성)"""
+        with self.lock:
+            return self.data.setdefault(name, {})
+
+    def page(self, page_id: str) -> Dict[str, Any]:
+        """Notion 페이지별 상태를 반환합니다 (없으면 생성)"""
+        with self.lock:
+            return self.section("pages").setdefault(page_id, {})
+
+    def save(self):
+        """상태를 파일에 저장합니다 (임시 파일에 쓴 뒤 교체)"""
+        if not self.path:
+            return
+        with self.lock:
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class SyncJournal:
+    """전체 동기화 한 번의 체크포인트 저널 (JSON Lines 파일, Actions cache로 보존)
+
+    완료된 이슈와 레포를 한 줄씩 바로 기록하므로, 실행이 중간에 끊겨도
+    다음 실행에서 --resume으로 이미 반영한 이슈와 레포를 건너뛸 수 있습니다.
+    """
+
+    def __init__(self, path: Optional[Path] = None, run_key: str = "", resume: bool = False,
+                 max_age_hours: float = 12, max_resumes: int = 6):
+        self.path = path
+        self.run_key = run_key  # 샤드 설정이 다른 실행의 저널은 이어받지 않음
+        # 계속 실패하는 이슈가 있어도 저널이 영원히 열려 있지 않도록 나이/재개 횟수로 만료
+        # (열려 있는 동안은 updated_at이 그대로인 Projects/마일스톤/담당자 변경이 전체 동기화에 반영되지 않음)
+        self.max_age_hours = max_age_hours
+        self.max_resumes = max_resumes
+        self.resumes = 0
+        self.lock = threading.Lock()
+        self.resumed = False
+        self.finished = False
+        self.completed_repos: set = set()
+        self.issues: Dict[str, Dict[int, str]] = {}  # repo → {이슈 번호: 반영한 updated_at}
+        self._file = None
+
+        if resume and path and path.exists():
+            self.resumed = self._load()
+        if self.resumed:
+            done = sum(len(issues) for issues in self.issues.values())
+            print(f"⏯️  체크포인트에서 재개 ({self.resumes + 1}번째): "
+                  f"완료된 레포 {len(self.completed_repos)}개, 완료된 이슈 {done}개")
+            self._open('a')
+            self._append({"resumed_at": datetime.utcnow().isoformat() + "Z"})
+        else:
+            self.completed_repos.clear()
+            self.issues.clear()
+            self._open('w')
+            self._append({"run": self.run_key, "started_at": datetime.utcnow().isoformat() + "Z"})
+
+    def _load(self) -> bool:
+        """저널을 읽어 완료 목록을 복원합니다 (이어받을 수 없으면 False)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError as e:
+            print(f"⚠ 체크포인트 저널 로드 실패 ({self.path}): {e}")
+            return False
+
+        header = None
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 기록 도중 끊긴 마지막 줄
+            if header is None:
+                header = entry
+                continue
+            if "issue" in entry:
+                self.issues.setdefault(entry["repo"], {})[entry["issue"]] = entry.get("updated_at")
+            elif entry.get("repo_done"):
+                self.completed_repos.add(entry["repo_done"])
+            elif entry.get("resumed_at"):
+                self.resumes += 1
+            elif entry.get("finished"):
+                self.finished = True
+
+        if not header or header.get("run") != self.run_key:
+            print("ℹ️  체크포인트 저널의 실행 설정(샤드)이 달라 처음부터 시작합니다.")
+            return False
+        if self.finished:
+            print("ℹ️  이전 실행이 정상 완료되어 처음부터 시작합니다.")
+            self.finished = False
+            return False
+        started_at = header.get("started_at")
+        age_hours = (time.time() - _timestamp(started_at)) / 3600 if started_at else 0
+        if age_hours > self.max_age_hours or self.resumes >= self.max_resumes:
+            print(f"ℹ️  체크포인트 저널이 만료되어 처음부터 시작합니다 "
+                  f"({age_hours:.1f}시간 경과, {self.resumes}번 재개)")
+            return False
+        return True
+
+    def _open(self, mode: str):
+        if self.path:
+            self._file = open(self.path, mode, encoding='utf-8')
+
+    def _append(self, entry: Dict[str, Any]):
+        """한 줄을 기록하고 바로 flush합니다 (프로세스가 죽어도 기록은 남음)"""
+        if not self._file:
+            return
+        with self.lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def is_done(self, issue: Issue) -> bool:
+        """이슈가 이 실행에서 이미 반영되었는지 확인합니다 (그 뒤 수정되었으면 다시 동기화)"""
+        done = self.issues.get(issue.repository, {})
+        return issue.number in done and done[issue.number] == issue.updated_at
+
+    def record_issue(self, issue: Issue):
+        with self.lock:
+            self.issues.setdefault(issue.repository, {})[issue.number] = issue.updated_at
+        self._append({"repo": issue.repository, "issue": issue.number, "updated_at": issue.updated_at})
+
+    def complete_repo(self, repo: str):
+        self.completed_repos.add(repo)
+        self._append({"repo_done": repo})
+
+    def finish(self):
+        """모든 레포가 성공하면 완료로 표시합니다 (다음 --resume은 처음부터 시작)"""
+        self.finished = True
+        self._append({"finished": True, "finished_at": datetime.utcnow().isoformat() + "Z"})
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class RateLimiter:
+    """초당 요청 수를 제한하는 스레드 안전 Rate Limiter"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """다음 요청 슬롯까지 대기합니다"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AssetMirror:
+    """GitHub 이미지/첨부 파일을 Notion에 한 번만 올리는 content-addressed 캐시
+
+    URL → sha256 → Notion file upload를 SyncState에 저장하므로, 이미 본 URL은 다시 내려받지 않고
+    같은 내용(다른 URL)은 다시 업로드하지 않습니다. 다운로드는 workers개까지만 병렬로 실행합니다.
+    """
+
+    # Notion은 첨부되지 않은 file upload를 1시간 뒤 만료시키므로, 그 전까지만 재사용
+    UNATTACHED_TTL = 50 * 60
+
+    def __init__(self, state: SyncState, workers: int = 4):
+        self.state = state
+        self.workers = max(1, int(workers))
+        self._executor = None
+        self._inflight: Dict[str, Any] = {}  # URL → Future (여러 이슈가 같은 파일을 동시에 참조할 때 한 번만 조회)
+        self._lock = threading.Lock()
+
+    def _usable(self, blob: Optional[Dict]) -> Optional[Dict]:
+        if blob and (blob.get("attached") or time.time() - blob.get("uploaded_at", 0) < self.UNATTACHED_TTL):
+            return blob
+        return None
+
+    def cached(self, url: str) -> Optional[Dict]:
+        """이미 미러링한 URL이면 저장된 파일 정보를 반환합니다"""
+        with self.state.lock:
+            digest = self.state.section("assets").get(url)
+            return self._usable(self.state.section("asset_blobs").get(digest)) if digest else None
+
+    def mirror(self, urls: Iterable[str], download: Callable[[str], Tuple[bytes, str, str]],
+               upload: Callable[[bytes, str, str], str]) -> Dict[str, Optional[Dict]]:
+        """URL들을 병렬로 미러링하고 URL → 파일 정보(실패하면 None)를 반환합니다"""
+        results: Dict[str, Optional[Dict]] = {}
+        futures = {}
+        for url in dict.fromkeys(urls):
+            blob = self.cached(url)
+            if blob:
+                results[url] = blob
+                continue
+            with self._lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor  # 첨부 파일이 있을 때만 필요
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asset")
+                future = self._inflight.get(url)
+                if future is None:
+                    future = self._executor.submit(self._mirror_one, url, download, upload)
+                    self._inflight[url] = future
+            futures[url] = future
+
+        for url, future in futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                print(f"    ⚠ 첨부 파일 미러링 실패 ({url}): {e}")
+                results[url] = None
+            finally:
+                with self._lock:
+                    self._inflight.pop(url, None)
+        return results
+
+    def _mirror_one(self, url: str, download: Callable, upload: Callable) -> Dict:
+        data, content_type, name = download(url)
+        digest = hashlib.sha256(data).hexdigest()
+        with self.state.lock:
+            blob = self._usable(self.state.section("asset_blobs").get(digest))
+        if blob is None:
+            blob = {
+                "upload_id": upload(data, name, content_type),
+                "content_type": content_type,
+                "name": name,
+                "size": len(data),
+                "uploaded_at": time.time(),
+                "attached": False,
+            }
+            with self.state.lock:
+                self.state.section("asset_blobs")[digest] = blob
+        with self.state.lock:
+            self.state.section("assets")[url] = digest
+        return blob
+
+    def mark_attached(self, blocks: List[Dict]):
+        """페이지에 붙은 file upload를 표시합니다 (이후로는 만료 걱정 없이 재사용)"""
+        upload_ids = set()
+        for block in blocks:
+            payload = block.get(block.get("type"), {})
+            if isinstance(payload, dict) and payload.get("type") == "file_upload":
+                upload_ids.add(payload["file_upload"]["id"])
+        if not upload_ids:
+            return
+        with self.state.lock:
+            for blob in self.state.section("asset_blobs").values():
+                if not blob.get("attached") and blob.get("upload_id") in upload_ids:
+                    blob["attached"] = True
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class GraphQLBudget:
+    """GitHub GraphQL 포인트 한도(기본 시간당 5,000점)를 추적하는 스레드 안전 예산
+
+    한도는 토큰 단위이므로 모든 레포가 하나를 공유합니다. 응답 헤더와 rateLimit 필드로
+    남은 포인트를 갱신하고, reserve 아래로 내려갈 쿼리는 실패시키는 대신 리셋까지 기다립니다.
+    """
+
+    def __init__(self, reserve: int = 100, max_query_cost: int = 10):
+        self.reserve = max(0, int(reserve))
+        self.max_query_cost = max(1, int(max_query_cost))
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None  # 아직 응답을 받지 않았으면 None
+        self.reset_at = 0.0  # epoch 초
+        self.retry_at = 0.0  # secondary rate limit (Retry-After)
+        self.queries = 0
+        self.cost = 0
+        self.paused_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate_cost(requests_per_item: int, items: int = 1) -> int:
+        """GitHub 방식의 예상 비용: 요청할 노드 수 합계 / 100 (최소 1점)"""
+        return max(1, -(-requests_per_item * items // 100))
+
+    def batch_size(self, requests_per_item: int, wanted: int) -> int:
+        """쿼리당 최대 비용과 남은 포인트 안에 들어가는 배치 크기를 계산합니다 (nodes 최대 100개)"""
+        max_cost = self.max_query_cost
+        with self._lock:
+            if self.remaining is not None:
+                max_cost = min(max_cost, max(1, self.remaining - self.reserve))
+        return max(1, min(wanted, 100, max_cost * 100 // max(1, requests_per_item)))
+
+    def acquire(self, cost: int = 1):
+        """쿼리를 보내기 전에 호출합니다 (한도가 부족하면 리셋까지 대기, 다른 워커도 함께 대기)"""
+        with self._lock:
+            now = time.time()
+            wait = self.retry_at - now
+            if self.remaining is not None and self.remaining - cost < self.reserve and self.reset_at > now:
+                wait = max(wait, self.reset_at - now + 1)
+            if wait > 0:
+                print(f"  ⏸️  GraphQL 한도 대기: 남은 포인트 {self.remaining}, {wait:.0f}초 후 재개")
+                time.sleep(wait)
+                self.paused_seconds += wait
+                self.remaining = None  # 리셋 이후 첫 응답으로 다시 확인
+            if self.remaining is not None:
+                self.remaining -= cost  # 응답 전에 미리 차감 (동시에 보내는 쿼리 대비)
+            self.queries += 1
+
+    def update_from_headers(self, headers) -> bool:
+        """응답 헤더로 한도를 갱신합니다 (한도 초과 응답이면 True)"""
+        if headers.get("x-ratelimit-resource", "graphql") != "graphql":
+            return False
+        with self._lock:
+            if headers.get("x-ratelimit-remaining") is not None:
+                self.remaining = int(headers["x-ratelimit-remaining"])
+            if headers.get("x-ratelimit-limit") is not None:
+                self.limit = int(headers["x-ratelimit-limit"])
+            if headers.get("x-ratelimit-reset") is not None:
+                self.reset_at = float(headers["x-ratelimit-reset"])
+            if headers.get("retry-after") is not None:
+                self.retry_at = time.time() + float(headers["retry-after"])
+                return True
+            return self.remaining == 0
+
+    def update(self, rate_limit: Dict[str, Any]):
+        """쿼리 결과의 rateLimit { cost remaining resetAt limit }를 반영합니다"""
+        with self._lock:
+            self.cost += int(rate_limit.get("cost") or 0)
+            if rate_limit.get("remaining") is not None:
+                self.remaining = int(rate_limit["remaining"])
+            if rate_limit.get("limit") is not None:
+                self.limit = int(rate_limit["limit"])
+            if rate_limit.get("resetAt"):
+                self.reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+
+    def exhausted(self):
+        """RATE_LIMITED 에러를 받았을 때 다음 acquire가 리셋까지 기다리도록 합니다"""
+        with self._lock:
+            self.remaining = 0
+            if self.reset_at <= time.time():
+                self.retry_at = time.time() + 60
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "cost": self.cost,
+            "remaining": self.remaining,
+            "limit": self.limit,
+            "paused_seconds": round(self.paused_seconds, 1),
+        }
+
+
+class RequestBudget:
+    """실행당 API 요청 예산 (GitHub + Notion 요청 수, 모든 레포가 공유)
+
+    max_requests가 없으면 세기만 합니다. 예산을 다 쓰면 남은 이슈는 쓰지 않고 다음 실행으로 미룹니다.
+    """
+
+    def __init__(self, max_requests: Optional[int] = None):
+        self.max_requests = int(max_requests) if max_requests else None
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self) -> bool:
+        return self.max_requests is not None
+
+    def count(self):
+        with self._lock:
+            self.used += 1
+
+    def exhausted(self) -> bool:
+        """예산을 다 썼는지 확인합니다 (이미 진행 중인 이슈 몇 개만큼은 넘을 수 있음)"""
+        return self.max_requests is not None and self.used >= self.max_requests
+
+    def reset(self):
+        """새 실행 단위로 예산을 다시 채웁니다 (poll 모드는 확인 주기마다)"""
+        with self._lock:
+            self.used = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"used": self.used, "max_requests": self.max_requests}
+
+
+class _Span:
+    """Tracer.span()이 돌려주는 구간 (with 문으로 사용)"""
+
+    __slots__ = ("tracer", "name", "category", "attrs", "started")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.started = 0.0
+
+    def set(self, **attrs):
+        """구간이 끝나기 전에 속성을 추가합니다 (응답 상태 코드 등)"""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "_Span":
+        self.started = time.perf_counter()
+        self.tracer._push(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._pop(self, time.perf_counter())
+        return False
+
+
+class _NoopSpan:
+    """추적을 끈 경우의 구간 (아무것도 기록하지 않음)"""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """단계(phase)와 API 호출을 구간(span) 단위로 기록해 Chrome trace 형식(JSON)으로 내보냅니다
+
+    내보낸 파일은 chrome://tracing 또는 https://ui.perfetto.dev 에서 열 수 있습니다.
+    category: repo(레포 전체), phase(fetch/enrich/convert/write 등), step(세부 단계), http(API 호출), wait(한도 대기)
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self._stacks: Dict[int, List[_Span]] = {}  # 스레드별 열린 구간 (프로파일러가 단계 판별에 사용)
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: str = "step", **attrs):
+        """구간을 만듭니다 (with 문으로 사용, 추적을 끄면 아무것도 하지 않음)"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, category, attrs)
+
+    def _push(self, span: _Span):
+        tid = threading.get_ident()
+        with self._lock:
+            stack = self._stacks.get(tid)
+            if stack is None:
+                stack = self._stacks[tid] = []
+                self.events.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                                    "args": {"name": threading.current_thread().name}})
+            stack.append(span)
+
+    def _pop(self, span: _Span, ended: float):
+        tid = threading.get_ident()
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": round((span.started - self._origin) * 1e6, 1),
+            "dur": round((ended - span.started) * 1e6, 1),
+            "pid": self._pid,
+            "tid": tid,
+            "args": span.attrs,
+        }
+        with self._lock:
+            stack = self._stacks.get(tid) or []
+            if stack and stack[-1] is span:
+                stack.pop()
+            self.events.append(event)
+
+    def current_phase(self, thread_id: int) -> Optional[str]:
+        """스레드가 지금 실행 중인 가장 안쪽 phase 구간의 이름 (없으면 None)"""
+        with self._lock:
+            for span in reversed(self._stacks.get(thread_id) or []):
+                if span.category == "phase":
+                    return span.name
+        return None
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """구간 이름별 횟수와 누적 시간(초)"""
+        totals: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for event in self.events:
+                if event["ph"] != "X":
+                    continue
+                key = f"{event['cat']}:{event['name']}"
+                total = totals.setdefault(key, {"count": 0, "seconds": 0.0})
+                total["count"] += 1
+                total["seconds"] += event["dur"] / 1e6
+        return totals
+
+    def print_summary(self, limit: int = 15):
+        print(f"추적 구간 요약 (누적 시간 상위 {limit}개, 병렬 구간은 겹쳐서 합산)")
+        totals = sorted(self.summary().items(), key=lambda item: item[1]["seconds"], reverse=True)
+        for key, total in totals[:limit]:
+            print(f"  {key:<36}{int(total['count']):>7}회{total['seconds']:>10.2f}초")
+
+    def export(self, path: str):
+        """Chrome trace 형식(JSON)으로 저장합니다"""
+        trace_path = Path(path)
+        if trace_path.parent:
+            trace_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        print(f"📈 추적 파일 저장: {trace_path} (chrome://tracing 또는 Perfetto에서 열기)")
+
+
+class SamplingProfiler:
+    """모든 스레드의 스택을 주기적으로 샘플링해 phase별 핫스팟을 집계합니다
+
+    cProfile은 호출한 스레드만 측정하므로, 파이프라인 워커 스레드까지 보려면 샘플링을 사용합니다.
+    각 샘플은 그 스레드가 실행 중인 Tracer의 phase 구간(fetch/enrich/convert/write 등)으로 분류됩니다.
+    """
+
+    def __init__(self, tracer: Tracer, interval: float = 0.005):
+        self.tracer = tracer
+        self.interval = interval
+        self.samples: Dict[str, int] = {}          # phase → 샘플 수
+        self.self_counts: Dict[str, Dict[str, int]] = {}   # phase → 함수 → 맨 위 프레임이었던 횟수
+        self.total_counts: Dict[str, Dict[str, int]] = {}  # phase → 함수 → 스택에 있었던 횟수
+        self.stacks: Dict[str, int] = {}           # "phase;f1;f2;..." → 횟수 (flame graph용 folded 형식)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                phase = self.tracer.current_phase(thread_id)
+                if phase:
+                    self._record(phase, frame)
+
+    def _record(self, phase: str, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.reverse()
+        self.samples[phase] = self.samples.get(phase, 0) + 1
+        self_counts = self.self_counts.setdefault(phase, {})
+        self_counts[names[-1]] = self_counts.get(names[-1], 0) + 1
+        total_counts = self.total_counts.setdefault(phase, {})
+        for name in set(names):
+            total_counts[name] = total_counts.get(name, 0) + 1
+        key = ";".join([phase] + names)
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def dump(self, directory: str, limit: int = 20):
+        """phase별 리포트(profile.txt)와 folded 스택(profile.folded)을 저장합니다"""
+        out_dir = Path(directory)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        lines = [f"샘플링 프로파일 (간격 {self.interval * 1000:.0f}ms, 샘플 수 ≈ 해당 phase에서 보낸 스레드 시간)"]
+        for phase, count in sorted(self.samples.items(), key=lambda item: item[1], reverse=True):
+            lines.append("")
+            lines.append(f"== {phase}: {count}개 샘플 (≈{count * self.interval:.2f}초) ==")
+            for title, counts in (("self", self.self_counts[phase]), ("cumulative", self.total_counts[phase])):
+                lines.append(f"  [{title}]")
+                for name, hits in sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]:
+                    lines.append(f"  {hits:>7} {hits * 100 / count:>5.1f}%  {name}")
+        (out_dir / "profile.txt").write_text("\n".join(lines) + "\n", encoding='utf-8')
+        with open(out_dir / "profile.folded", 'w', encoding='utf-8') as f:
+            for key, hits in self.stacks.items():
+                f.write(f"{key} {hits}\n")
+        print(f"🔬 프로파일 저장: {out_dir / 'profile.txt'}, {out_dir / 'profile.folded'}")
+
+
+_STAGE_DONE = object()  # 단계 종료 신호
+
+
+class PipelineStage:
+    """파이프라인의 한 단계 (워커 스레드 + 입력 큐)"""
+
+    def __init__(self, name: str, handler: Callable[[Any], Iterable], workers: int = 1,
+                 batch_size: int = 1, queue_size: int = 50):
+        self.name = name
+        self.handler = handler  # item(batch_size > 1이면 list)을 받아 다음 단계로 보낼 항목들을 반환
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.input: queue.Queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self.next_stage: Optional["PipelineStage"] = None
+
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._alive = 0
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        self._alive = self.workers
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def sample_depth(self):
+        depth = self.input.qsize()
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_total += depth
+            self._depth_samples += 1
+
+    def _next_batch(self) -> tuple:
+        """입력 큐에서 최대 batch_size개를 꺼냅니다 (종료 신호 여부 함께 반환)"""
+        item = self.input.get()
+        if item is _STAGE_DONE:
+            return [], True
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.input.get(timeout=0.05)
+            except queue.Empty:
+                break
+            if item is _STAGE_DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        done = False
+        while not done:
+            batch, done = self._next_batch()
+            if not batch:
+                continue
+            started = time.monotonic()
+            try:
+                outputs = self.handler(batch if self.batch_size > 1 else batch[0])
+                outputs = list(outputs or [])
+                ok = True
+            except Exception as e:
+                print(f"  ✗ [{self.name}] 처리 실패: {e}")
+                outputs, ok = [], False
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.busy_time += elapsed
+                if ok:
+                    self.processed += len(batch)
+                else:
+                    self.failed += len(batch)
+            if self.next_stage:
+                for output in outputs:
+                    self.next_stage.input.put(output)  # 큐가 가득 차면 대기 (backpressure)
+
+        with self._lock:
+            self._alive -= 1
+            last = self._alive == 0
+        if last and self.next_stage:
+            for _ in range(self.next_stage.workers):
+                self.next_stage.input.put(_STAGE_DONE)
+
+    def stats(self, wall_time: float) -> Dict[str, Any]:
+        capacity = wall_time * self.workers
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_time, 3),
+            "utilization": round(self.busy_time / capacity, 3) if capacity > 0 else 0.0,
+            "max_queue_depth": self.max_depth,
+            "avg_queue_depth": round(self._depth_total / self._depth_samples, 2) if self._depth_samples else 0.0,
+        }
+
+
+class Pipeline:
+    """bounded queue로 연결된 단계들을 실행합니다"""
+
+    def __init__(self, stages: List[PipelineStage], sample_interval: float = 0.2):
+        self.stages = stages
+        self.sample_interval = sample_interval
+        for current, following in zip(stages, stages[1:]):
+            current.next_stage = following
+        self.sinks: List[PipelineStage] = []  # 마지막 단계가 항목을 나눠 보내는 단계 (데이터베이스별 writer)
+        self._sinks_lock = threading.Lock()
+        self.wall_time = 0.0
+
+    def add_sink(self, stage: PipelineStage):
+        """실행 중에 마지막 단계 뒤에 붙는 단계를 추가하고 시작합니다 (run이 끝날 때 함께 종료)"""
+        stage.start()
+        with self._sinks_lock:
+            self.sinks.append(stage)
+
+    def run(self, items: Iterable) -> Dict[str, Dict[str, Any]]:
+        """첫 단계에 items를 넣고 모든 단계가 끝날 때까지 실행합니다"""
+        started = time.monotonic()
+        for stage in self.stages:
+            stage.start()
+
+        stop_sampling = threading.Event()
+
+        def sample():
+            while not stop_sampling.wait(self.sample_interval):
+                with self._sinks_lock:
+                    sinks = list(self.sinks)
+                for stage in self.stages + sinks:
+                    stage.sample_depth()
+
+        sampler = threading.Thread(target=sample, name="pipeline-monitor", daemon=True)
+        sampler.start()
+
+        first = self.stages[0]
+        for item in items:
+            first.input.put(item)
+        for _ in range(first.workers):
+            first.input.put(_STAGE_DONE)
+
+        for stage in self.stages:
+            stage.join()
+        # 마지막 단계가 끝났으므로 더 이상 sink가 추가되거나 항목을 받지 않음
+        for sink in self.sinks:
+            for _ in range(sink.workers):
+                sink.input.put(_STAGE_DONE)
+            sink.join()
+        stop_sampling.set()
+        sampler.join()
+
+        self.wall_time = time.monotonic() - started
+        return self.stats()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {stage.name: stage.stats(self.wall_time) for stage in self.stages + self.sinks}
+
+    def print_stats(self):
+        print(f"파이프라인 단계별 통계 (총 {self.wall_time:.1f}초)")
+        stats = self.stats()
+        width = max([10] + [len(name) + 2 for name in stats])
+        print(f"  {'단계':<{width}}{'워커':>6}{'처리':>8}{'실패':>6}{'가동률':>9}{'최대 큐':>9}{'평균 큐':>9}")
+        for name, stat in stats.items():
+            print(f"  {name:<{width}}{stat['workers']:>6}{stat['processed']:>8}{stat['failed']:>6}"
+                  f"{stat['utilization'] * 100:>8.0f}%{stat['max_queue_depth']:>9}{stat['avg_queue_depth']:>9}")
+
+
+def _timestamp(value: Optional[str]) -> float:
+    """ISO 8601 시각(예: 2024-01-01T00:00:00Z)을 epoch 초로 변환합니다 (없으면 0)"""
+    if not value:
+        return 0.0
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """'i/n' 형식의 샤드 지정을 (i, n)으로 변환합니다 (i는 1부터 n까지)"""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', text or "")
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"샤드는 'i/n' 형식이어야 합니다 (1 ≤ i ≤ n): {text}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def shard_of(key: str, count: int) -> int:
+    """키를 1~count 중 하나의 샤드에 배정합니다 (실행/머신과 무관하게 항상 같은 결과)"""
+    return zlib.crc32(key.encode('utf-8')) % count + 1
+
+
+def load_pipeline_config(config: Optional[Dict]) -> Dict[str, Any]:
+    """config.yml의 pipeline 항목을 기본값과 합칩니다"""
+    pipeline_config = dict(DEFAULT_PIPELINE_CONFIG)
+    pipeline_config.update((config or {}).get('pipeline') or {})
+    return pipeline_config
+
+
+def create_http_session(pipeline_config: Dict[str, Any], tracer: Optional[Tracer] = None,
+                        budget: Optional[RequestBudget] = None) -> requests.Session:
+    """파이프라인 워커 수에 맞춘 커넥션 풀을 가진 HTTP 세션을 만듭니다
+
+    모든 요청을 요청 예산(budget)에 세고, 추적 중이면 http 구간으로 기록합니다.
+    """
+    pool_size = sum(int(pipeline_config[key]) for key in ("fetch_workers", "enrich_workers", "write_workers"))
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(10, pool_size))
+    session.mount("https://", adapter)
+
+    if (tracer and tracer.enabled) or budget:
+        send = session.request
+        tracer = tracer or Tracer()
+
+        def counted_request(method, url, *args, **kwargs):
+            if budget:
+                budget.count()
+            host, _, path = url.partition("://")[2].partition("/")
+            with tracer.span(f"{method} {host}", "http", path="/" + path.split("?")[0]) as span:
+                response = send(method, url, *args, **kwargs)
+                span.set(status=response.status_code)
+                return response
+
+        session.request = counted_request  # get/post/patch 모두 request를 거침
+    return session
+
+
+class GitHubNotionSync:
+    def __init__(self, repo: str, notion_api_key: str, notion_database_id: str,
+                 config: Optional[Dict] = None, notion_limiter: Optional[RateLimiter] = None,
+                 state: Optional[SyncState] = None, shard: Optional[Tuple[int, int]] = None,
+                 github_token: Optional[str] = None, session: Optional[requests.Session] = None,
+                 field_mapper: Optional[FieldMapper] = None, journal: Optional[SyncJournal] = None,
+                 graphql_budget: Optional[GraphQLBudget] = None, asset_mirror: Optional[AssetMirror] = None,
+                 tracer: Optional[Tracer] = None, request_budget: Optional[RequestBudget] = None,
+                 router: Optional[DatabaseRouter] = None, people: Optional[PeopleDirectory] = None):
+        self.repo = repo  # format: "owner/repo"
+        self.shard = shard  # (i, n): 이 실행이 맡은 이슈 샤드 (None이면 전체)
+        self.notion_api_key = notion_api_key
+        self.notion_database_id = notion_database_id
+        self.github_token = github_token or os.environ.get('GITHUB_TOKEN')
+
+        self.sync_comments_enabled = bool((config or {}).get('sync_comments', False))
+        # 필드 매핑은 실행당 한 번 컴파일 (SyncEngine이 넘겨주면 그대로 재사용)
+        self.field_mapper = field_mapper or FieldMapper.from_config(config)
+        # 이슈별 대상 데이터베이스 (config.yml의 databases 규칙, SyncEngine이 넘겨주면 캐시를 레포 간 공유)
+        self.router = router or DatabaseRouter.from_config(notion_database_id, config)
+        self.needs_projects = self.field_mapper.uses_projects or self.router.uses_projects
+        self.use_page_index = False  # 전체 동기화 중에는 레포 페이지를 한 번에 불러와 이슈별 검색을 생략
+        back_sync_config = (config or {}).get('back_sync') or {}
+        self.back_sync_enabled = bool(back_sync_config.get('enabled', False))
+        reverse_targets = self.field_mapper.reverse_targets()
+        self.back_sync_properties = {
+            name: target for name, target in reverse_targets.items()
+            if name in back_sync_config.get('properties', reverse_targets)
+        }
+        self.state = state or SyncState()
+        # GitHub 로그인 → Notion 사용자 (people 속성용, 실행당 한 번 조회하고 상태 파일에 캐시)
+        self.people = people or PeopleDirectory.from_config(self.state, config)
+        self.journal = journal  # 전체 동기화의 체크포인트 (--resume 시 완료된 이슈 건너뜀)
+        assets_config = (config or {}).get('assets') or {}
+        self.mirror_assets = bool(assets_config.get('mirror', True))
+        self.asset_max_bytes = int(float(assets_config.get('max_size_mb', 20)) * 1024 * 1024)
+        self.asset_mirror = asset_mirror or AssetMirror(self.state, assets_config.get('workers', 4))
+
+        self.pipeline_config = load_pipeline_config(config)
+
+        # 여러 레포를 동기화해도 Notion 제한은 하나이므로 limiter/세션은 공유 가능
+        self.notion_limiter = notion_limiter or RateLimiter(self.pipeline_config["notion_rate_limit"])
+        self.tracer = tracer or Tracer()  # 기본은 꺼짐 (--trace / --profile)
+        budget_config = (config or {}).get('budget') or {}
+        self.request_budget = request_budget or RequestBudget(budget_config.get('max_requests'))
+        # 우선순위 순서로 동기화 (요청 예산이 있으면 기본으로 켜짐)
+        self.prioritize = bool(budget_config.get('prioritize', self.request_budget.limited))
+        self.session = session or create_http_session(self.pipeline_config, self.tracer, self.request_budget)
+        # GraphQL 포인트 한도도 토큰 단위이므로 SyncEngine이 넘겨주면 모든 레포가 공유
+        self.graphql_budget = graphql_budget or GraphQLBudget(self.pipeline_config["graphql_reserve"],
+                                                              self.pipeline_config["graphql_max_query_cost"])
+        # 이슈 조회 시 요청할 필드 값 개수 (관찰한 최대 필드 수에 맞춰 조정, 넘치면 추가 페이지 조회)
+        # enrich 워커들이 함께 읽고 고치므로 _field_values_lock으로 보호하고, 쿼리마다 한 번 읽은 값을 끝까지 사용
+        self.field_values_first = 20
+        self._max_field_values = 0
+        self._field_values_lock = threading.Lock()
+        self.pipeline_stats: Dict[str, Dict[str, Any]] = {}
+        self._pipeline: Optional[Pipeline] = None
+        self._label_colors: Optional[Dict[str, str]] = None  # 라벨 이름 → 색 (전체 동기화마다 새로 조회)
+        self._milestones_lock = threading.Lock()
+        poll_config = dict(DEFAULT_POLL_CONFIG, **((config or {}).get('poll') or {}))
+        self.poll_projects = bool(poll_config["projects"])
+        self.poll_interval_hint = 0  # GitHub가 알려 준 최소 polling 간격 (X-Poll-Interval)
+        self._milestones_checked: set = set()  # 인덱스에 없어서 마일스톤을 다시 반영해 본 마일스톤 ID
+        self._writers: Dict[str, PipelineStage] = {}  # 데이터베이스 ID → 쓰기 단계
+        self._writers_lock = threading.Lock()
+        
+        self.notion_headers = {
+            "Authorization": f"Bearer {self.notion_api_key}",
+            "Content-Type": "application/json",
+            "Notion-Version": "2022-06-28"
+        }
+        
+        self.github_headers = {
+            "Accept": "application/vnd.github.v3+json"
+        }
+        if self.github_token:
+            self.github_headers["Authorization"] = f"token {self.github_token}"
+
+    def _notion_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Notion API를 호출합니다 (rate limit 적용, 429 응답 시 재시도)"""
+        headers = kwargs.pop("headers", self.notion_headers)
+        for attempt in range(4):
+            with self.tracer.span("notion.rate_limit", "wait"):
+                self.notion_limiter.acquire()
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            if response.status_code != 429 or attempt == 3:
+                return response
+            time.sleep(float(response.headers.get("Retry-After", 1)))
+        return response
+
+    def in_shard(self, issue_number: int) -> bool:
+        """이슈가 이 실행의 샤드에 속하는지 확인합니다 ((repo, 이슈 번호) 해시 기준)"""
+        if not self.shard:
+            return True
+        index, count = self.shard
+        return shard_of(f"{self.repo}#{issue_number}", count) == index
+
+    def _fetch_issue_page(self, page: int) -> tuple:
+        """이슈 목록의 한 페이지를 가져옵니다 (이슈 목록, 마지막 페이지 번호)"""
+        url = f"https://api.github.com/repos/{self.repo}/issues"
+        params = {
+            "state": "all",  # open, closed, all
+            "per_page": 100,
+            "page": page
+        }
+        response = self.session.get(url, headers=self.github_headers, params=params)
+        response.raise_for_status()
+
+        last_page = page
+        last_link = response.links.get("last", {}).get("url", "")
+        last_match = re.search(r'[?&]page=(\d+)', last_link)
+        if last_match:
+            last_page = int(last_match.group(1))
+
+        # Pull Requests 및 다른 샤드의 이슈 제외 (Issues API가 PR도 포함함)
+        issues = [Issue.from_github(issue, self.repo) for issue in response.json()
+                  if 'pull_request' not in issue and self.in_shard(issue['number'])]
+        return issues, last_page
+
+    def iter_github_issue_pages(self) -> Iterable[List[Issue]]:
+        """GitHub Issues를 페이지 단위로 가져옵니다 (2페이지부터는 병렬 조회)"""
+        first_issues, last_page = self._fetch_issue_page(1)
+        yield first_issues
+        yield from self._fetch_issue_pages(range(2, last_page + 1))
+
+    def _fetch_issue_pages(self, pages: range) -> Iterable[List[Issue]]:
+        """여러 이슈 페이지를 병렬로 가져옵니다 (끝난 순서대로)"""
+        if not pages:
+            return
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed  # 여러 페이지일 때만 필요
+
+        workers = int(self.pipeline_config["fetch_workers"])
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._fetch_issue_page, page) for page in pages]
+            for future in as_completed(futures):
+                yield future.result()[0]
+
+    def get_github_issues(self) -> List[Issue]:
+        """GitHub Issues를 가져옵니다"""
+        try:
+            issues = [issue for page in self.iter_github_issue_pages() for issue in page]
+            print(f"✓ GitHub에서 {len(issues)}개의 이슈를 가져왔습니다.")
+            return issues
+        except requests.exceptions.RequestException as e:
+            print(f"✗ GitHub API 호출 실패: {e}")
+            raise  # 이 레포만 실패로 처리 (다른 레포와 체크포인트는 유지)
+
+    def get_github_issue(self, issue_number: int) -> Optional[Issue]:
+        """GitHub Issue 하나를 가져옵니다 (PR이거나 없으면 None)"""
+        url = f"https://api.github.com/repos/{self.repo}/issues/{issue_number}"
+        response = self.session.get(url, headers=self.github_headers)
+        if response.status_code in (404, 410):
+            return None
+        response.raise_for_status()
+        data = response.json()
+        if 'pull_request' in data:
+            return None
+        return Issue.from_github(data, self.repo)
+
+    def get_issue_projects_info(self, issue: Issue) -> Dict[str, Any]:
+        """GraphQL로 이슈의 Projects V2 정보를 가져옵니다 (모든 레벨 포함)"""
+        issue_number = issue.number
+        node_id = issue.node_id  # Issue의 global node ID
+        
+        if not node_id:
+            print(f"  ⚠ Issue #{issue_number}: node_id 없음")
+            return {}
+        
+        # GraphQL 쿼리 - node_id를 사용하여 모든 레벨의 Projects 조회
+        fields_first = self._current_field_values_first()
+        query = """
+        query($nodeId: ID!) {
+          node(id: $nodeId) {
+            ... on Issue {
+%s
+            }
+          }
+%s
+        }
+        """ % (self._project_items_selection(fields_first), RATE_LIMIT_SELECTION)
         
         variables = {
             "nodeId": node_id
         }
         
         try:
-            response = requests.post(
+            data = self._graphql(query, variables, cost=self._projects_query_cost(1, fields_first))
+            
+            if "errors" in data:
+                print(f"  ⚠ GraphQL 에러 (Issue #{issue_number}): {data['errors']}")
+                return {}
+            
+            # 필드 값이 한 페이지를 넘는 경우 나머지를 가져온 뒤 파싱
+            self._complete_field_values((data.get("data") or {}).get("node"))
+            return self._parse_projects_data(data)
+            
+        except requests.exceptions.RequestException as e:
+            print(f"  ⚠ Projects 정보 조회 실패 (Issue #{issue_number}): {e}")
+            return {}
+
+    def _graphql(self, query: str, variables: Dict, cost: int = 1) -> Dict:
+        """GitHub GraphQL API를 호출합니다 (포인트 한도를 확인하고, 한도 초과 시 리셋 후 재시도)"""
+        for attempt in range(3):
+            with self.tracer.span("graphql.budget", "wait", cost=cost):
+                self.graphql_budget.acquire(cost)
+            response = self.session.post(
                 "https://api.github.com/graphql",
                 headers={
                     "Authorization": f"Bearer {self.github_token}",
@@ -150,20 +1797,127 @@ class GitHubNotionSync:
                 },
                 json={"query": query, "variables": variables}
             )
+            limited = self.graphql_budget.update_from_headers(response.headers)
+            if response.status_code in (403, 429) and limited and attempt < 2:
+                continue  # 다음 acquire에서 리셋(또는 Retry-After)까지 대기
             response.raise_for_status()
             data = response.json()
-            
-            if "errors" in data:
-                print(f"  ⚠ GraphQL 에러 (Issue #{issue_number}): {data['errors']}")
-                return {}
-            
-            # 프로젝트 정보 파싱
-            return self._parse_projects_data(data)
-            
+
+            rate_limit = (data.get("data") or {}).get("rateLimit")
+            if rate_limit:
+                self.graphql_budget.update(rate_limit)
+            if any(error.get("type") == "RATE_LIMITED" for error in data.get("errors") or []) and attempt < 2:
+                self.graphql_budget.exhausted()
+                continue
+            return data
+        return data
+
+    def _current_field_values_first(self) -> int:
+        """이번 쿼리에 쓸 fieldValues 페이지 크기 (쿼리 문자열과 예상 비용에 같은 값을 쓰도록 한 번만 읽음)"""
+        with self._field_values_lock:
+            return self.field_values_first
+
+    @staticmethod
+    def _project_items_selection(fields_first: int) -> str:
+        """fieldValues 페이지 크기로 projectItems 선택 필드를 만듭니다"""
+        # 첫 번째 프로젝트만 사용하므로 projectItems는 1개만 요청 (비용은 first 값의 곱에 비례)
+        return PROJECT_ITEMS_SELECTION % {
+            "items_first": 1,
+            "fields_first": fields_first,
+            "field_values": PROJECT_FIELD_VALUES_SELECTION,
+        }
+
+    @staticmethod
+    def _projects_query_cost(issues: int, fields_first: int) -> int:
+        """이슈 issues개의 Projects 조회 예상 비용"""
+        return GraphQLBudget.estimate_cost(GitHubNotionSync._projects_requests_per_issue(fields_first), issues)
+
+    @staticmethod
+    def _projects_requests_per_issue(fields_first: int) -> int:
+        # 이슈 1 + projectItems 1 + fieldValues fields_first
+        return 2 + fields_first
+
+    def _complete_field_values(self, node: Optional[Dict]):
+        """fieldValues가 한 페이지를 넘는 프로젝트 아이템의 나머지 필드 값을 가져와 합칩니다"""
+        items = ((node or {}).get("projectItems") or {}).get("nodes") or []
+        for item in items:
+            field_values = (item or {}).get("fieldValues") or {}
+            with self._field_values_lock:
+                self._max_field_values = max(self._max_field_values, field_values.get("totalCount") or 0)
+            page_info = field_values.get("pageInfo") or {}
+            while page_info.get("hasNextPage") and item.get("id"):
+                query = """
+                query($itemId: ID!, $after: String) {
+                  node(id: $itemId) {
+                    ... on ProjectV2Item {
+                      fieldValues(first: 100, after: $after) {
+%s
+                      }
+                    }
+                  }
+%s
+                }
+                """ % (PROJECT_FIELD_VALUES_SELECTION, RATE_LIMIT_SELECTION)
+                data = self._graphql(query, {"itemId": item["id"], "after": page_info.get("endCursor")},
+                                     cost=GraphQLBudget.estimate_cost(101))
+                more = (((data.get("data") or {}).get("node") or {}).get("fieldValues")) or {}
+                field_values.setdefault("nodes", []).extend(more.get("nodes") or [])
+                page_info = more.get("pageInfo") or {}
+
+        if items:
+            # 다음 조회부터는 지금까지 관찰한 최대 필드 수만큼만 요청 (적으면 비용 절감, 많으면 추가 페이지 생략)
+            with self._field_values_lock:
+                self.field_values_first = max(8, min(100, self._max_field_values))
+
+    def get_projects_info_batch(self, issues: List[Issue]) -> Dict[str, Dict[str, Any]]:
+        """여러 이슈의 Projects V2 정보를 GraphQL로 가져옵니다 (node_id → 정보)
+
+        남은 포인트와 쿼리당 최대 비용에 맞춰 배치를 나눠 조회합니다.
+        """
+        node_ids = [issue.node_id for issue in issues if issue.node_id]
+        results: Dict[str, Dict[str, Any]] = {}
+        while node_ids:
+            fields_first = self._current_field_values_first()
+            size = self.graphql_budget.batch_size(self._projects_requests_per_issue(fields_first), len(node_ids))
+            chunk, node_ids = node_ids[:size], node_ids[size:]
+            results.update(self._fetch_projects_chunk(chunk, fields_first))
+        return results
+
+    def _fetch_projects_chunk(self, node_ids: List[str], fields_first: int) -> Dict[str, Dict[str, Any]]:
+        """이슈 묶음 하나의 Projects V2 정보를 GraphQL 한 번으로 가져옵니다 (fields_first: 배치 크기를 정한 값)"""
+        query = """
+        query($ids: [ID!]!) {
+          nodes(ids: $ids) {
+            ... on Issue {
+              id
+%s
+            }
+          }
+%s
+        }
+        """ % (self._project_items_selection(fields_first), RATE_LIMIT_SELECTION)
+
+        try:
+            data = self._graphql(query, {"ids": node_ids},
+                                 cost=self._projects_query_cost(len(node_ids), fields_first))
         except requests.exceptions.RequestException as e:
-            print(f"  ⚠ Projects 정보 조회 실패 (Issue #{issue_number}): {e}")
+            print(f"  ⚠ Projects 정보 일괄 조회 실패 ({len(node_ids)}개 이슈): {e}")
             return {}
 
+        if data.get("errors"):
+            # 일부 노드 에러가 있어도 나머지 결과는 사용
+            print(f"  ⚠ GraphQL 에러 (일괄 조회): {data['errors']}")
+
+        results = {}
+        for node in (data.get("data") or {}).get("nodes") or []:
+            if node and node.get("id"):
+                try:
+                    self._complete_field_values(node)
+                except requests.exceptions.RequestException as e:
+                    print(f"  ⚠ Projects 필드 값 추가 조회 실패: {e}")
+                results[node["id"]] = self._parse_projects_data({"data": {"node": node}})
+        return results
+
     def _parse_projects_data(self, data: Dict) -> Dict[str, Any]:
         """GraphQL 응답에서 프로젝트 정보를 파싱합니다"""
         try:
@@ -223,8 +1977,9 @@ class GitHubNotionSync:
                 elif "date" in field_value:
                     field_obj = field_value.get("field", {})
                     field_name = field_obj.get("name")
-                    date_value = field_value.get("date", {})
-                    field_data = date_value.get("start")  # start 날짜만 사용
+                    date_value = field_value.get("date")
+                    # Date 스칼라 ("YYYY-MM-DD"), 예전 형식({start, end})이면 start만 사용
+                    field_data = date_value.get("start") if isinstance(date_value, dict) else date_value
                 
                 if field_name and field_data is not None:
                     project_info["fields"][field_name] = field_data
@@ -235,8 +1990,11 @@ class GitHubNotionSync:
             print(f"  ⚠ Projects 데이터 파싱 실패: {e}")
             return {}
 
-    def convert_body_to_blocks(self, body: str) -> List[Dict]:
-        """이슈 본문(Markdown)을 Notion 블록으로 변환합니다"""
+    def convert_body_to_blocks(self, body: str, assets: Optional[Dict[str, Optional[Dict]]] = None) -> List[Dict]:
+        """이슈 본문(Markdown)을 Notion 블록으로 변환합니다
+
+        assets는 미리 미러링한 첨부 파일 (파이프라인의 assets 단계), 없으면 여기서 미러링합니다.
+        """
         if not body or body.strip() == "":
             return [{
                 "object": "block",
@@ -251,6 +2009,8 @@ class GitHubNotionSync:
         
         blocks = []
         lines = body.split('\n')
+        if assets is None:
+            assets = self._mirror_body_assets(lines)  # 본문의 첨부 파일을 먼저 병렬로 미러링
         i = 0
         
         while i < len(lines):
@@ -263,6 +2023,13 @@ class GitHubNotionSync:
                 i += lines_consumed
                 continue
             
+            # 이미지/첨부 파일만 있는 줄 (![alt](url), <img src>, GitHub 첨부 링크)
+            asset_line = self._match_asset_line(line)
+            if asset_line:
+                blocks.append(self._create_asset_block(line, *asset_line, assets.get(asset_line[1])))
+                i += 1
+                continue
+            
             # 헤딩 처리 (# ## ###)
             heading_match = re.match(r'^(#{1,3})\s+(.+)$', line)
             if heading_match:
@@ -315,6 +2082,105 @@ class GitHubNotionSync:
         
         return blocks
 
+    def _match_asset_line(self, line: str) -> Optional[Tuple[str, str, str]]:
+        """이미지/첨부 파일만 있는 줄이면 (종류, URL, 설명)을 반환합니다"""
+        match = MARKDOWN_IMAGE_LINE.match(line)
+        if match:
+            return "image", match.group(2), match.group(1)
+        match = HTML_IMAGE_LINE.match(line)
+        if match:
+            alt = HTML_ALT.search(line)
+            return "image", match.group(1), alt.group(1) if alt else ""
+        match = MARKDOWN_LINK_LINE.match(line)
+        if match and GITHUB_ASSET_URL.match(match.group(2)):
+            return "file", match.group(2), match.group(1)
+        match = BARE_URL_LINE.match(line)
+        if match and GITHUB_ASSET_URL.match(match.group(1)):
+            return "file", match.group(1), ""  # 드래그 앤 드롭한 동영상 등 (종류는 내려받은 뒤 결정)
+        return None
+
+    def _mirror_body_assets(self, lines: List[str]) -> Dict[str, Optional[Dict]]:
+        """본문의 GitHub 첨부 파일을 Notion으로 미러링합니다 (코드 블록 안의 줄은 제외)"""
+        if not self.mirror_assets:
+            return {}
+        urls = []
+        in_code = False
+        for line in lines:
+            if line.strip().startswith('```'):
+                in_code = not in_code
+                continue
+            asset_line = None if in_code else self._match_asset_line(line)
+            if asset_line and GITHUB_ASSET_URL.match(asset_line[1]):
+                urls.append(asset_line[1])
+        if not urls:
+            return {}
+        with self.tracer.span("assets.mirror", assets=len(urls)):
+            return self.asset_mirror.mirror(urls, self._download_asset, self._upload_asset)
+
+    def _download_asset(self, url: str) -> Tuple[bytes, str, str]:
+        """첨부 파일을 내려받습니다 (내용, Content-Type, 파일 이름)"""
+        with self.tracer.span("assets", "phase", repo=self.repo, url=url):
+            return self._fetch_asset(url)
+
+    def _fetch_asset(self, url: str) -> Tuple[bytes, str, str]:
+        headers = {}
+        host = re.match(r'https://([^/]+)', url).group(1)
+        if self.github_token and (host == "github.com" or host.endswith(".githubusercontent.com")):
+            headers["Authorization"] = f"token {self.github_token}"  # 비공개 레포 첨부 파일 (리다이렉트 시 제거됨)
+
+        with self.session.get(url, headers=headers, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            chunks, size = [], 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > self.asset_max_bytes:
+                    raise ValueError(f"파일이 너무 큽니다 (최대 {self.asset_max_bytes // (1024 * 1024)}MB)")
+                chunks.append(chunk)
+            content_type = response.headers.get("Content-Type", "application/octet-stream").split(";")[0].strip()
+            disposition = response.headers.get("Content-Disposition", "")
+
+        name_match = re.search(r'filename="?([^";]+)"?', disposition)
+        name = name_match.group(1) if name_match else url.rstrip('/').rsplit('/', 1)[-1].split('?')[0]
+        if '.' not in name:
+            import mimetypes  # 확장자가 없는 URL(user-attachments/assets/<uuid>)일 때만 필요
+            name += mimetypes.guess_extension(content_type) or ""
+        return b"".join(chunks), content_type, name
+
+    def _upload_asset(self, data: bytes, name: str, content_type: str) -> str:
+        """Notion File Upload API로 파일을 올리고 file upload ID를 반환합니다"""
+        response = self._notion_request("POST", "https://api.notion.com/v1/file_uploads",
+                                        json={"filename": name, "content_type": content_type})
+        response.raise_for_status()
+        upload_id = response.json()["id"]
+
+        # 파일 전송은 multipart이므로 JSON Content-Type 헤더는 빼고 보냄
+        headers = {key: value for key, value in self.notion_headers.items() if key != "Content-Type"}
+        response = self._notion_request("POST", f"https://api.notion.com/v1/file_uploads/{upload_id}/send",
+                                        headers=headers, files={"file": (name, data, content_type)})
+        response.raise_for_status()
+        return upload_id
+
+    def _create_asset_block(self, line: str, kind: str, url: str, label: str, blob: Optional[Dict]) -> Dict:
+        """이미지/첨부 파일 블록을 만듭니다 (미러링하지 못한 GitHub 첨부 파일은 원래 줄을 그대로 둠)"""
+        caption = [{"type": "text", "text": {"content": label[:2000]}}] if label else []
+        if blob:
+            content_type = blob.get("content_type", "")
+            if content_type.startswith("image/"):
+                block_type = "image"
+            elif content_type.startswith("video/"):
+                block_type = "video"
+            elif content_type == "application/pdf":
+                block_type = "pdf"
+            else:
+                block_type = "file"
+            payload = {"type": "file_upload", "file_upload": {"id": blob["upload_id"]}, "caption": caption}
+        elif kind == "image" and url.startswith("https://") and not (self.mirror_assets and GITHUB_ASSET_URL.match(url)):
+            block_type = "image"
+            payload = {"type": "external", "external": {"url": url}, "caption": caption}
+        else:
+            return self._create_paragraph_block(line)
+        return {"object": "block", "type": block_type, block_type: payload}
+
     def _parse_code_block(self, lines: List[str]) -> tuple:
         """코드 블록 파싱 (``` ~ ```)"""
         first_line = lines[0].strip()
@@ -514,9 +2380,11 @@ class GitHubNotionSync:
             "text": {"content": text}
         }]
 
-    def search_notion_page_by_issue_number(self, issue_number: int, repository: str) -> Optional[str]:
-        """Notion에서 이슈 번호 + 레포지토리로 페이지를 검색합니다"""
-        url = f"https://api.notion.com/v1/databases/{self.notion_database_id}/query"
+    def search_notion_page_by_issue_number(self, issue_number: int, repository: str,
+                                           database: Optional[NotionDatabase] = None) -> Optional[str]:
+        """Notion에서 이슈 번호 + 레포지토리로 페이지를 검색합니다 (기본: 기본 데이터베이스)"""
+        database = database or self.router.default
+        url = f"https://api.notion.com/v1/databases/{database.id}/query"
         
         # Issue Number AND Repository로 검색 (중복 방지)
         data = {
@@ -539,7 +2407,7 @@ class GitHubNotionSync:
         }
         
         try:
-            response = requests.post(url, headers=self.notion_headers, json=data)
+            response = self._notion_request("POST", url, json=data)
             response.raise_for_status()
             results = response.json().get("results", [])
             
@@ -550,412 +2418,1330 @@ class GitHubNotionSync:
             print(f"✗ Notion 검색 실패 ({repository} Issue #{issue_number}): {e}")
             return None
 
-    def create_notion_page(self, issue: Dict) -> bool:
-        """Notion에 새 페이지를 생성합니다"""
+    def load_schema(self, database: NotionDatabase) -> Optional[Dict[str, str]]:
+        """데이터베이스 속성 목록을 한 번만 조회해 캐시합니다 (실패하면 필터링 없이 진행)"""
+        if database.schema is not None:
+            return database.schema
+        with database.schema_lock:
+            if database.schema is None:
+                url = f"https://api.notion.com/v1/databases/{database.id}"
+                try:
+                    response = self._notion_request("GET", url)
+                    response.raise_for_status()
+                    database.set_schema(response.json().get("properties", {}))
+                except requests.exceptions.RequestException as e:
+                    print(f"⚠ Notion 데이터베이스 '{database.name}' 스키마 조회 실패: {e}")
+                    database.schema = None
+        return database.schema
+
+    def _fetch_notion_users(self) -> List[Dict]:
+        """Notion 워크스페이스 사용자 목록을 모두 가져옵니다 (100명씩 페이지네이션)"""
+        users: List[Dict] = []
+        params: Dict[str, Any] = {"page_size": 100}
+        while True:
+            response = self._notion_request("GET", "https://api.notion.com/v1/users", params=params)
+            response.raise_for_status()
+            result = response.json()
+            users.extend(result.get("results", []))
+            if not result.get("has_more"):
+                return users
+            params["start_cursor"] = result["next_cursor"]
+
+    def load_people(self, database: NotionDatabase):
+        """대상 데이터베이스에 people 속성이 있으면 사용자 디렉터리를 불러옵니다 (실행당 한 번)"""
+        if self.people.fresh:
+            return
+        names = self.field_mapper.people_properties()
+        schema = self.load_schema(database) if names else None
+        if names and (schema is None or any(schema.get(name) == "people" for name in names)):
+            with self.tracer.span("notion.users"):
+                self.people.load(self._fetch_notion_users)
+
+    def get_label_colors(self) -> Dict[str, str]:
+        """레포 라벨 이름 → 색(hex)을 조회합니다 (동기화 실행당 한 번, 100개씩 페이지네이션)"""
+        if self._label_colors is not None:
+            return self._label_colors
+        colors: Dict[str, str] = {}
+        url = f"https://api.github.com/repos/{self.repo}/labels"
+        page = 1
+        while True:
+            response = self.session.get(url, headers=self.github_headers, params={"per_page": 100, "page": page})
+            response.raise_for_status()
+            labels = response.json()
+            colors.update({label["name"]: label.get("color") for label in labels})
+            if len(labels) < 100:
+                break
+            page += 1
+        self._label_colors = colors
+        return colors
+
+    def ensure_label_options(self, database: NotionDatabase, labels: Iterable[str]):
+        """라벨 multi_select 속성에 없는 옵션을 데이터베이스 수정으로 한꺼번에 추가합니다 (GitHub 라벨 색 사용)
+
+        Notion은 페이지를 쓸 때 없는 옵션을 임의 색으로 만들고, 동시에 쓰면 충돌할 수 있으므로 미리 추가합니다.
+        이미 있는 옵션의 색은 API로 바꿀 수 없어 새 옵션에만 색을 맞춥니다.
+        여러 실행(--shard-by repo)이 같은 데이터베이스를 고칠 수 있으므로 쓰기 직전에 스키마를 다시 읽어 합칩니다.
+        """
+        if not self.load_schema(database):
+            return
+        properties = [database.property_name(name) for name in self.field_mapper.label_properties()]
+        properties = [name for name in properties if name and database.schema.get(name) == "multi_select"]
+        names = {option_name(label).strip() for label in labels} - {""}
+        with database.schema_lock:
+            if not any(names - set(database.options.get(name, {})) for name in properties):
+                return  # 캐시에 모두 있음 (보통의 경우, 요청 없음)
+            try:
+                if self._label_colors is not None and not names <= set(self._label_colors):
+                    self._label_colors = None  # 캐시 이후 새로 만든 라벨이면 색을 다시 조회
+                colors = {option_name(label).strip(): color for label, color in self.get_label_colors().items()}
+            except requests.exceptions.RequestException as e:
+                print(f"⚠ 라벨 색 조회 실패 (기본 색 사용): {e}")
+                colors = {}
+            url = f"https://api.notion.com/v1/databases/{database.id}"
+            added: set = set()
+            try:
+                # options PATCH는 목록 전체를 바꾸므로, 다른 샤드가 방금 추가한 옵션을 지우지 않도록
+                # 바로 전에 스키마를 다시 읽어 합치고, 쓴 뒤 다시 읽어 빠진 옵션이 있으면 재시도
+                for _ in range(3):
+                    response = self._notion_request("GET", url)
+                    response.raise_for_status()
+                    database.set_schema(response.json().get("properties", {}))
+                    missing = {name: sorted(names - set(database.options.get(name, {}))) for name in properties}
+                    missing = {name: options for name, options in missing.items() if options}
+                    if not missing:
+                        break
+                    data = {"properties": {
+                        name: {"multi_select": {"options": list(database.options.get(name, {}).values()) + [
+                            {"name": option, "color": notion_color(colors.get(option))} for option in options]}}
+                        for name, options in missing.items()
+                    }}
+                    response = self._notion_request("PATCH", url, json=data)
+                    response.raise_for_status()
+                    database.set_schema(response.json().get("properties", {}))
+                    added.update(option for options in missing.values() for option in options)
+                else:
+                    print(f"⚠ '{database.name}' 데이터베이스 라벨 옵션이 동시 수정으로 계속 바뀌어 일부를 추가하지 못했습니다")
+            except requests.exceptions.RequestException as e:
+                # 실패해도 페이지 쓰기 때 Notion이 옵션을 만들어 주므로 동기화는 계속
+                print(f"⚠ '{database.name}' 데이터베이스 라벨 옵션 추가 실패: {e}")
+            if added:
+                added = sorted(added)
+                print(f"🏷️  '{database.name}' 데이터베이스에 라벨 옵션 {len(added)}개 추가: {', '.join(added[:10])}"
+                      + (" ..." if len(added) > 10 else ""))
+
+    def load_page_index(self, database: NotionDatabase, key_property: str = "Issue Number") -> bool:
+        """이 레포의 페이지를 한 번에 조회해 번호(key_property) → page_id 인덱스를 만듭니다 (100개씩 페이지네이션)"""
+        if database.indexed(self.repo):
+            return True
+        with database.repo_lock(self.repo):
+            if database.indexed(self.repo):
+                return True
+            pages: Dict[int, str] = {}
+            try:
+                with self.tracer.span("notion.index", repo=self.repo, database=database.name):
+                    for page in self.iter_database_pages(
+                            {"property": "Repository", "rich_text": {"equals": self.repo}}, database=database):
+                        number = read_notion_property(page.get("properties", {}).get(key_property))
+                        if number is not None:
+                            pages.setdefault(int(number), page["id"])  # 중복 페이지는 검색과 같이 첫 번째 사용
+            except requests.exceptions.RequestException as e:
+                print(f"⚠ Notion 데이터베이스 '{database.name}' 페이지 인덱스 조회 실패 (인덱스 없이 진행): {e}")
+                return False
+            with database.lock:
+                database.pages[self.repo] = pages
+            return True
+
+    def find_page_in(self, database: NotionDatabase, issue_number: int) -> Optional[str]:
+        """데이터베이스에서 이슈 페이지를 찾습니다 (전체 동기화 중이면 인덱스, 아니면 검색 쿼리)"""
+        if self.use_page_index and self.load_page_index(database):
+            return database.lookup(self.repo, issue_number)
+        return self.search_notion_page_by_issue_number(issue_number, self.repo, database)
+
+    def find_issue_page(self, issue_number: int) -> Optional[str]:
+        """이 레포의 이슈가 들어갈 수 있는 모든 데이터베이스에서 페이지를 찾습니다"""
+        for database in self.router.candidates(self.repo):
+            page_id = self.find_page_in(database, issue_number)
+            if page_id:
+                return page_id
+        return None
+
+    def archive_moved_page(self, issue: Issue, target: NotionDatabase):
+        """라벨/Projects가 바뀌어 다른 데이터베이스로 옮겨 가는 이슈의 이전 페이지를 보관 처리합니다"""
+        for database in self.router.candidates(self.repo):
+            if database is target:
+                continue
+            page_id = self.find_page_in(database, issue.number)
+            if not page_id:
+                continue
+            response = self._notion_request("PATCH", f"https://api.notion.com/v1/pages/{page_id}",
+                                            json={"archived": True})
+            response.raise_for_status()
+            database.forget(self.repo, issue.number)
+            print(f"  ↪ Issue #{issue.number}: '{database.name}' → '{target.name}' 데이터베이스로 이동")
+
+    def get_github_milestones(self) -> List[Dict]:
+        """레포의 마일스톤을 모두 가져옵니다 (열림/닫힘 모두, 100개씩 페이지네이션)"""
+        url = f"https://api.github.com/repos/{self.repo}/milestones"
+        milestones: List[Dict] = []
+        page = 1
+        while True:
+            response = self.session.get(url, headers=self.github_headers,
+                                        params={"state": "all", "per_page": 100, "page": page})
+            response.raise_for_status()
+            batch = response.json()
+            milestones.extend(batch)
+            if len(batch) < 100:
+                return milestones
+            page += 1
+
+    def _milestone_properties(self, milestone: Dict) -> Dict[str, Dict]:
+        """마일스톤 데이터베이스 페이지 속성 (데이터베이스에 없는 속성은 filter_properties에서 빠짐)"""
+        due_on = milestone.get("due_on")
+        return {
+            "Title": {"title": [{"text": {"content": milestone["title"][:2000]}}]},
+            "Milestone ID": {"number": milestone["id"]},
+            "Repository": {"rich_text": [{"text": {"content": self.repo}}]},
+            "Status": {"select": {"name": "Open" if milestone.get("state") == "open" else "Closed"}},
+            "Due date": {"date": {"start": due_on[:10]} if due_on else None},
+            "URL": {"url": milestone.get("html_url")},
+            "Description": {"rich_text": [{"text": {"content": (milestone.get("description") or "")[:2000]}}]},
+            "Open Issues": {"number": milestone.get("open_issues", 0)},
+            "Closed Issues": {"number": milestone.get("closed_issues", 0)},
+        }
+
+    @property
+    def writes_milestones(self) -> bool:
+        """이 실행이 레포의 마일스톤 페이지를 쓰는지 (이슈 샤딩 시 레포 이름 해시로 정한 샤드 하나만 씀)
+
+        샤드들이 동시에 쓰면 새 마일스톤마다 페이지가 샤드 수만큼 생기므로, 나머지 샤드는 인덱스만 불러옵니다.
+        """
+        if not self.shard:
+            return True
+        index, count = self.shard
+        return shard_of(self.repo, count) == index
+
+    def sync_milestones(self) -> int:
+        """마일스톤을 마일스톤 데이터베이스에 반영하고 마일스톤 ID → page_id 인덱스를 채웁니다 (실패 수 반환)
+
+        마일스톤 목록과 인덱스는 한 번씩만 조회하고, 지난번에 쓴 값과 같은 마일스톤은 다시 쓰지 않습니다.
+        """
+        database = self.router.milestones
+        if database is None:
+            return 0
+        with self._milestones_lock:
+            self.load_schema(database)
+            database.forget(self.repo)  # 다른 실행이 만든 페이지가 있을 수 있으므로 인덱스를 새로 불러옴
+            if not self.load_page_index(database, "Milestone ID"):
+                return 1
+            if not self.writes_milestones:
+                return 0  # 다른 샤드가 이 레포의 마일스톤을 씀 (여기서는 인덱스만 사용)
+            try:
+                with self.tracer.span("milestones", "phase", repo=self.repo):
+                    milestones = self.get_github_milestones()
+            except requests.exceptions.RequestException as e:
+                print(f"⚠ 마일스톤 조회 실패: {e}")
+                return 1
+
+            written, failed = 0, 0
+            for milestone in milestones:
+                properties = database.filter_properties(self._milestone_properties(milestone))
+                fingerprint = hashlib.sha256(json.dumps(properties, sort_keys=True).encode()).hexdigest()
+                page_id = database.lookup(self.repo, milestone["id"])
+                with self.state.lock:
+                    if page_id and self.state.page(page_id).get("milestone_fingerprint") == fingerprint:
+                        continue
+                try:
+                    if page_id:
+                        response = self._notion_request("PATCH", f"https://api.notion.com/v1/pages/{page_id}",
+                                                        json={"properties": properties})
+                        response.raise_for_status()
+                    else:
+                        response = self._notion_request("POST", "https://api.notion.com/v1/pages", json={
+                            "parent": {"database_id": database.id}, "properties": properties})
+                        response.raise_for_status()
+                        page_id = response.json()["id"]
+                        database.remember(self.repo, milestone["id"], page_id)
+                    with self.state.lock:
+                        self.state.page(page_id)["milestone_fingerprint"] = fingerprint
+                    written += 1
+                except requests.exceptions.RequestException as e:
+                    print(f"  ✗ 마일스톤 '{milestone['title']}' 동기화 실패: {e}")
+                    failed += 1
+            print(f"🏁 마일스톤 {len(milestones)}개 확인, {written}개 반영" + (f", 실패 {failed}개" if failed else ""))
+            return failed
+
+    def _milestone_relation(self, issue: Issue) -> Optional[Dict]:
+        """이슈의 마일스톤 relation 값 (마일스톤 데이터베이스가 없거나 페이지를 못 찾으면 None = 쓰지 않음)"""
+        database = self.router.milestones
+        if database is None:
+            return None
+        if issue.milestone_id is None:
+            return {"relation": []}
+        page_id = database.lookup(self.repo, issue.milestone_id)
+        if page_id is None and issue.milestone_id not in self._milestones_checked:
+            # 이벤트 동기화이거나 실행 중에 만든 마일스톤: 목록을 한 번 다시 반영 (같은 ID로는 재시도하지 않음)
+            self._milestones_checked.add(issue.milestone_id)
+            self.sync_milestones()
+            page_id = database.lookup(self.repo, issue.milestone_id)
+        return {"relation": [{"id": page_id}]} if page_id else None
+
+    def _issue_properties(self, issue: Issue, database: NotionDatabase, for_update: bool = False) -> Dict[str, Dict]:
+        """이슈 페이지 속성 payload (필드 매핑 + 마일스톤 relation, 대상 데이터베이스 스키마에 맞춤)"""
+        properties = self.field_mapper.build(issue, for_update=for_update, people=self.people)
+        relation = self._milestone_relation(issue)
+        if relation is not None:
+            properties[self.router.milestone_property] = relation
+        return database.filter_properties(properties)
+
+    def create_notion_page(self, issue: Issue, blocks: Optional[List[Dict]] = None,
+                           database: Optional[NotionDatabase] = None) -> bool:
+        """Notion에 새 페이지를 생성합니다 (blocks를 미리 변환했다면 재사용)"""
         url = "https://api.notion.com/v1/pages"
         
-        # 라벨 처리
-        labels = [label["name"] for label in issue.get("labels", [])]
-        labels_text = ", ".join(labels) if labels else "없음"
-        
-        # 상태 매핑
-        status = "Open" if issue["state"] == "open" else "Closed"
+        # Projects V2 정보 조회 (enrich 단계를 거치지 않은 경우)
+        if issue.projects is None and self.needs_projects:
+            issue.projects = self.get_issue_projects_info(issue)
         
+        database = database or self.router.route(issue)
+        self.load_schema(database)
         data = {
-            "parent": {"database_id": self.notion_database_id},
-            "properties": {
-                "Title": {
-                    "title": [
-                        {
-                            "text": {
-                                "content": issue["title"]
-                            }
-                        }
-                    ]
-                },
-                "Issue Number": {
-                    "number": issue["number"]
-                },
-                "Status": {
-                    "select": {
-                        "name": status
-                    }
-                },
-                "Labels": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": labels_text
-                            }
-                        }
-                    ]
-                },
-                "URL": {
-                    "url": issue["html_url"]
-                },
-                "Created At": {
-                    "date": {
-                        "start": issue["created_at"]
-                    }
-                }
-            }
+            "parent": {"database_id": database.id},
+            "properties": self._issue_properties(issue, database)
         }
         
-        # Assignee 추가 (있는 경우)
-        if issue.get("assignee"):
-            data["properties"]["Assignee"] = {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": issue["assignee"]["login"]
-                        }
-                    }
-                ]
-            }
+        # 이슈 본문을 페이지 콘텐츠로 추가
+        if blocks is None:
+            blocks = self.convert_body_to_blocks(issue.body)
+        fingerprint = self._blocks_fingerprint(blocks)
+        if self.sync_comments_enabled:
+            # 코멘트 섹션을 맨 앞에 두면 본문을 다시 만들어도 위치가 바뀌지 않음
+            blocks = [self._create_comments_heading_block()] + blocks
+        data["children"] = blocks
+        
+        try:
+            response = self._notion_request("POST", url, json=data)
+            response.raise_for_status()
+            page_id = response.json().get("id")
+            database.remember(self.repo, issue.number, page_id)
+            self._remember_written(page_id, data["properties"])
+            self._remember_body(page_id, fingerprint, blocks, issue.body)
+            print(f"  ✓ Issue #{issue.number} 생성 완료: {issue.title}")
+            return True
+        except requests.exceptions.RequestException as e:
+            print(f"  ✗ Issue #{issue.number} 생성 실패: {e}")
+            if hasattr(e.response, 'text'):
+                print(f"    에러 상세: {e.response.text}")
+            return False
+
+    def update_notion_page(self, page_id: str, issue: Issue, blocks: Optional[List[Dict]] = None,
+                           database: Optional[NotionDatabase] = None) -> bool:
+        """Notion 페이지를 업데이트합니다 (blocks를 미리 변환했다면 재사용)"""
+        url = f"https://api.notion.com/v1/pages/{page_id}"
+        
+        # Projects V2 정보 조회 (enrich 단계를 거치지 않은 경우)
+        if issue.projects is None and self.needs_projects:
+            issue.projects = self.get_issue_projects_info(issue)
+        
+        database = database or self.router.route(issue)
+        self.load_schema(database)
+        data = {"properties": self._issue_properties(issue, database, for_update=True)}
         
-        # Milestone 추가 (있는 경우)
-        if issue.get("milestone"):
-            data["properties"]["Milestone"] = {
+        try:
+            # 1. 페이지 속성 업데이트
+            response = self._notion_request("PATCH", url, json=data)
+            response.raise_for_status()
+            self._remember_written(page_id, data["properties"])
+            
+            # 2. 페이지 본문(블록) 업데이트
+            self.update_page_content(page_id, issue, blocks)
+            
+            print(f"  ✓ Issue #{issue.number} 업데이트 완료: {issue.title}")
+            return True
+        except requests.exceptions.RequestException as e:
+            print(f"  ✗ Issue #{issue.number} 업데이트 실패: {e}")
+            if hasattr(e.response, 'text'):
+                print(f"    에러 상세: {e.response.text}")
+            return False
+
+    def update_page_content(self, page_id: str, issue: Issue, blocks: Optional[List[Dict]] = None):
+        """페이지 본문(블록)을 업데이트합니다 (코멘트 섹션은 유지)"""
+        if blocks is None:
+            blocks = self.convert_body_to_blocks(issue.body)
+        
+        # 변환 결과가 지난번에 쓴 본문과 같으면 블록을 다시 만들지 않음 (첨부 파일 ID까지 포함한 지문)
+        fingerprint = self._blocks_fingerprint(blocks)
+        with self.state.lock:
+            page_state = self.state.page(page_id)
+            if page_state.get("body_fingerprint") == fingerprint:
+                page_state["body_source"] = self._body_hash(issue.body)  # 원문만 바뀌고 결과가 같은 경우
+                return
+        
+        try:
+            # 1. 기존 블록 가져오기
+            blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
+            with self.tracer.span("blocks.list", issue=issue.number):
+                existing_blocks = self._list_child_blocks(page_id)
+            
+            # 2. 기존 블록 삭제 (코멘트 섹션 제외)
+            with self.tracer.span("blocks.delete", issue=issue.number, blocks=len(existing_blocks)):
+                for block in existing_blocks:
+                    if self._is_comments_heading(block):
+                        continue
+                    delete_url = f"https://api.notion.com/v1/blocks/{block['id']}"
+                    self._notion_request("DELETE", delete_url)
+            
+            # 3. 새 블록 추가
+            append_data = {"children": blocks}
+            with self.tracer.span("blocks.append", issue=issue.number, blocks=len(blocks)):
+                response = self._notion_request("PATCH", blocks_url, json=append_data)
+            response.raise_for_status()
+            self._remember_body(page_id, fingerprint, blocks, issue.body)
+            
+        except requests.exceptions.RequestException as e:
+            print(f"    ⚠ 본문 업데이트 실패 (속성은 업데이트됨): {e}")
+
+    @staticmethod
+    def _blocks_fingerprint(blocks: List[Dict]) -> str:
+        """변환된 본문 블록의 지문 (본문, 변환 규칙, 미러링한 첨부 파일 중 하나라도 바뀌면 달라짐)"""
+        return hashlib.sha256(json.dumps(blocks, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+    @staticmethod
+    def _body_hash(body: Optional[str]) -> str:
+        """이슈 본문 원문의 해시 (audit이 블록을 읽지 않고 본문이 최신인지 확인하는 데 사용)"""
+        return hashlib.sha256((body or "").encode()).hexdigest()
+
+    def _remember_body(self, page_id: Optional[str], fingerprint: str, blocks: List[Dict], source: Optional[str]):
+        """페이지에 쓴 본문의 지문과 원문 해시를 기록하고, 붙인 file upload를 첨부됨으로 표시합니다"""
+        if not page_id:
+            return
+        with self.state.lock:
+            page_state = self.state.page(page_id)
+            page_state["body_fingerprint"] = fingerprint
+            page_state["body_source"] = self._body_hash(source)
+        self.asset_mirror.mark_attached(blocks)
+
+    def _list_child_blocks(self, block_id: str) -> List[Dict]:
+        """블록(페이지)의 하위 블록을 모두 가져옵니다"""
+        url = f"https://api.notion.com/v1/blocks/{block_id}/children"
+        params = {"page_size": 100}
+        results = []
+        while True:
+            response = self._notion_request("GET", url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            results.extend(data.get("results", []))
+            if not data.get("has_more"):
+                return results
+            params["start_cursor"] = data["next_cursor"]
+
+    def _create_comments_heading_block(self) -> Dict:
+        """코멘트 섹션 블록 생성 (접을 수 있는 헤딩, 코멘트는 하위 블록으로 추가)"""
+        return {
+            "object": "block",
+            "type": "heading_2",
+            "heading_2": {
+                "rich_text": [{"type": "text", "text": {"content": COMMENTS_HEADING}}],
+                "is_toggleable": True
+            }
+        }
+
+    def _is_comments_heading(self, block: Dict) -> bool:
+        """코멘트 섹션 헤딩 블록인지 확인합니다"""
+        if block.get("type") != "heading_2":
+            return False
+        rich_text = block.get("heading_2", {}).get("rich_text", [])
+        return "".join(part.get("plain_text") or part.get("text", {}).get("content", "")
+                       for part in rich_text) == COMMENTS_HEADING
+
+    def _create_comment_block(self, comment: Comment) -> Dict:
+        """코멘트 블록 생성 (코멘트 하나 = 블록 하나, 수정 시 해당 블록만 PATCH)"""
+        header = f"{comment.author} · {comment.created_at[:10]}\n"
+        body = comment.body.strip() or "(내용 없음)"
+        if len(header) + len(body) > 2000:  # Notion rich text 제한
+            body = body[:1997 - len(header)] + "..."
+        return {
+            "object": "block",
+            "type": "callout",
+            "callout": {
                 "rich_text": [
-                    {
-                        "text": {
-                            "content": issue["milestone"]["title"]
-                        }
-                    }
-                ]
+                    {"type": "text", "text": {"content": header}, "annotations": {"bold": True}},
+                    {"type": "text", "text": {"content": body}}
+                ],
+                "icon": {"type": "emoji", "emoji": "💬"}
             }
-        
-        # Repository 추가 (여러 레포 지원 시 유용)
-        data["properties"]["Repository"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": self.repo
-                    }
-                }
-            ]
         }
-        
-        # Projects V2 정보 조회 및 추가
-        projects_info = self.get_issue_projects_info(issue)
-        if projects_info:
-            # Project 이름
-            if projects_info.get("project_title"):
-                data["properties"]["Project"] = {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": projects_info["project_title"]
-                            }
-                        }
-                    ]
-                }
-            
-            # Projects 필드들
-            fields = projects_info.get("fields", {})
-            
-            # Status (Backlog, Ready, In progress, In review, Done)
-            if "Status" in fields:
-                data["properties"]["Project Status"] = {
-                    "select": {
-                        "name": fields["Status"]
-                    }
-                }
-            
-            # Priority
-            if "Priority" in fields:
-                data["properties"]["Priority"] = {
-                    "select": {
-                        "name": fields["Priority"]
-                    }
-                }
-            
-            # Story Points (Number)
-            if "Story Points" in fields:
-                data["properties"]["Story Points"] = {
-                    "number": fields["Story Points"]
-                }
-            
-            # Capacity (Number)
-            if "Capacity" in fields:
-                data["properties"]["Capacity"] = {
-                    "number": fields["Capacity"]
-                }
-            
-            # Sprint (Iteration)
-            if "Sprint" in fields:
-                data["properties"]["Sprint"] = {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": str(fields["Sprint"])
-                            }
-                        }
-                    ]
-                }
-            
-            # Date 필드들 (Start date, Target date, Due date 등)
-            # Date 타입 필드는 자동으로 감지하여 추가
-            date_field_names = ["Start date", "Target date", "Due date", "Start Date", "Target Date", "Due Date"]
-            for date_field in date_field_names:
-                if date_field in fields:
-                    data["properties"][date_field] = {
-                        "date": {
-                            "start": fields[date_field]
-                        }
-                    }
-        
-        # 이슈 본문을 페이지 콘텐츠로 추가
-        issue_body = issue.get("body", "")
-        data["children"] = self.convert_body_to_blocks(issue_body)
-        
-        try:
-            response = requests.post(url, headers=self.notion_headers, json=data)
-            response.raise_for_status()
-            print(f"  ✓ Issue #{issue['number']} 생성 완료: {issue['title']}")
-            return True
-        except requests.exceptions.RequestException as e:
-            print(f"  ✗ Issue #{issue['number']} 생성 실패: {e}")
-            if hasattr(e.response, 'text'):
-                print(f"    에러 상세: {e.response.text}")
-            return False
 
-    def update_notion_page(self, page_id: str, issue: Dict) -> bool:
-        """Notion 페이지를 업데이트합니다"""
-        url = f"https://api.notion.com/v1/pages/{page_id}"
-        
-        # 라벨 처리
-        labels = [label["name"] for label in issue.get("labels", [])]
-        labels_text = ", ".join(labels) if labels else "없음"
-        
-        # 상태 매핑
-        status = "Open" if issue["state"] == "open" else "Closed"
-        
-        data = {
-            "properties": {
-                "Title": {
-                    "title": [
-                        {
-                            "text": {
-                                "content": issue["title"]
-                            }
-                        }
-                    ]
-                },
-                "Status": {
-                    "select": {
-                        "name": status
-                    }
-                },
-                "Labels": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": labels_text
-                            }
-                        }
-                    ]
-                },
-                "URL": {
-                    "url": issue["html_url"]
+    def get_issue_comments_since(self, since: Optional[str]) -> List[Comment]:
+        """레포의 이슈 코멘트를 since 이후 변경분만 한 번에 가져옵니다 (이슈별 조회 없음)"""
+        url = f"https://api.github.com/repos/{self.repo}/issues/comments"
+        params: Optional[Dict] = {"sort": "updated", "direction": "asc", "per_page": 100}
+        if since:
+            params["since"] = since
+
+        comments = []
+        while url:
+            response = self.session.get(url, headers=self.github_headers, params=params)
+            response.raise_for_status()
+            for data in response.json():
+                # PR 코멘트도 포함되므로 제외 (html_url이 /pull/N#issuecomment-...)
+                if "/pull/" in data.get("html_url", ""):
+                    continue
+                comments.append(Comment.from_github(data))
+            url = response.links.get("next", {}).get("url")
+            params = None  # next 링크에 쿼리가 포함되어 있음
+        return comments
+
+    def _find_comments_heading(self, page_id: str) -> str:
+        """페이지의 코멘트 섹션 블록 ID를 찾고, 없으면 새로 만듭니다"""
+        for block in self._list_child_blocks(page_id):
+            if self._is_comments_heading(block):
+                return block["id"]
+
+        response = self._notion_request(
+            "PATCH", f"https://api.notion.com/v1/blocks/{page_id}/children",
+            json={"children": [self._create_comments_heading_block()]}
+        )
+        response.raise_for_status()
+        return response.json()["results"][0]["id"]
+
+    def sync_page_comments(self, page_id: str, comments: List[Comment]):
+        """새 코멘트는 코멘트 섹션에 추가하고, 수정된 코멘트는 해당 블록만 업데이트합니다"""
+        with self.state.lock:
+            page_state = self.state.page(page_id)
+            last_comment_id = page_state.get("last_comment_id", 0)
+            comment_blocks = dict(page_state.get("comment_blocks", {}))  # comment id → [block id, updated_at]
+            heading_id = page_state.get("comments_block")
+
+        new_comments = sorted((c for c in comments if c.id > last_comment_id), key=lambda c: c.id)
+        edited_comments = [
+            c for c in comments
+            if c.id <= last_comment_id and str(c.id) in comment_blocks
+            and comment_blocks[str(c.id)][1] != c.updated_at
+        ]
+        if not new_comments and not edited_comments:
+            return
+
+        if new_comments and not heading_id:
+            heading_id = self._find_comments_heading(page_id)
+
+        def save():
+            # 성공한 만큼 바로 기록 (뒤에서 실패해도 같은 코멘트를 다시 추가하지 않음)
+            with self.state.lock:
+                page_state.update(
+                    last_comment_id=last_comment_id,
+                    comment_blocks=dict(comment_blocks),
+                    comments_block=heading_id,
+                )
+
+        # 새 코멘트: 한 번에 최대 100개씩 추가
+        for start in range(0, len(new_comments), 100):
+            chunk = new_comments[start:start + 100]
+            response = self._notion_request(
+                "PATCH", f"https://api.notion.com/v1/blocks/{heading_id}/children",
+                json={"children": [self._create_comment_block(c) for c in chunk]}
+            )
+            response.raise_for_status()
+            for comment, block in zip(chunk, response.json().get("results", [])):
+                comment_blocks[str(comment.id)] = [block["id"], comment.updated_at]
+                last_comment_id = max(last_comment_id, comment.id)
+            save()
+
+        # 수정된 코멘트: 해당 블록만 업데이트
+        for comment in edited_comments:
+            block_id = comment_blocks[str(comment.id)][0]
+            block = self._create_comment_block(comment)
+            response = self._notion_request(
+                "PATCH", f"https://api.notion.com/v1/blocks/{block_id}",
+                json={"callout": {"rich_text": block["callout"]["rich_text"]}}
+            )
+            if response.status_code == 404 or (response.status_code == 400 and "archived" in response.text):
+                # Notion에서 블록을 지운 코멘트: 더 이상 따라가지 않음 (매번 실패해 페이지를 막지 않도록)
+                print(f"    ℹ️  코멘트 {comment.id} 블록이 Notion에서 삭제되어 수정을 건너뜁니다")
+                comment_blocks.pop(str(comment.id), None)
+            else:
+                response.raise_for_status()
+                comment_blocks[str(comment.id)][1] = comment.updated_at
+            save()
+
+        save()
+        print(f"  💬 Issue #{comments[0].issue_number}: 코멘트 {len(new_comments)}개 추가, {len(edited_comments)}개 수정")
+
+    def sync_comments(self, comments: Optional[List[Comment]] = None) -> int:
+        """since 커서 이후 변경된 코멘트를 페이지별로 동기화합니다 (실패 수 반환)"""
+        cursors = self.state.section("comment_cursors")
+        since = cursors.get(self.repo)
+
+        if comments is None:
+            try:
+                comments = self.get_issue_comments_since(since)
+            except requests.exceptions.RequestException as e:
+                print(f"✗ 코멘트 조회 실패: {e}")
+                return 1
+        if not comments:
+            return 0
+
+        by_issue: Dict[int, List[Comment]] = {}
+        for comment in comments:
+            if self.in_shard(comment.issue_number):
+                by_issue.setdefault(comment.issue_number, []).append(comment)
+
+        failed_since = []
+        pending_since = []  # 아직 페이지가 없는 이슈 (실패는 아니지만 페이지가 생긴 뒤 다시 가져와야 함)
+        for issue_number, issue_comments in sorted(by_issue.items()):
+            page_id = self.find_issue_page(issue_number)
+            if not page_id:
+                pending_since.append(min(c.updated_at for c in issue_comments))
+                continue
+            try:
+                self.sync_page_comments(page_id, issue_comments)
+            except requests.exceptions.RequestException as e:
+                print(f"  ✗ Issue #{issue_number} 코멘트 동기화 실패: {e}")
+                failed_since.append(min(c.updated_at for c in issue_comments))
+        if pending_since:
+            print(f"  ℹ️  페이지가 아직 없는 이슈 {len(pending_since)}개의 코멘트는 다음 동기화에서 처리합니다.")
+
+        # 실패했거나 페이지가 없어 못 쓴 코멘트가 있으면 다음 실행에서 다시 가져오도록 커서를 그 시점까지만 이동
+        with self.state.lock:
+            if failed_since or pending_since:
+                cursors[self.repo] = min(failed_since + pending_since)
+            else:
+                cursors[self.repo] = max(c.updated_at for c in comments)
+        return len(failed_since)
+
+    def _remember_written(self, page_id: Optional[str], properties: Dict):
+        """역방향 동기화용으로 이번에 Notion에 쓴 값을 기록합니다 (루프 방지)"""
+        if not self.back_sync_enabled or not page_id:
+            return
+        written = {name: read_notion_property(find_notion_property(properties, name))
+                   for name in self.back_sync_properties}
+        with self.state.lock:
+            self.state.page(page_id)["written"] = written
+
+    def iter_database_pages(self, filter_: Optional[Dict] = None, sorts: Optional[List[Dict]] = None,
+                            database: Optional[NotionDatabase] = None) -> Iterable[Dict]:
+        """Notion 데이터베이스를 조건에 맞게 페이지 단위로 조회합니다 (기본: 기본 데이터베이스)"""
+        url = f"https://api.notion.com/v1/databases/{(database or self.router.default).id}/query"
+        data: Dict[str, Any] = {"page_size": 100}
+        if filter_:
+            data["filter"] = filter_
+        if sorts:
+            data["sorts"] = sorts
+        while True:
+            response = self._notion_request("POST", url, json=data)
+            response.raise_for_status()
+            result = response.json()
+            yield from result.get("results", [])
+            if not result.get("has_more"):
+                return
+            data["start_cursor"] = result["next_cursor"]
+
+    def get_project_items_for_update(self, issue_numbers: List[int]) -> Dict[int, List[Dict]]:
+        """이슈별 Projects 아이템/필드 ID를 한 번의 GraphQL로 가져옵니다 (필드 업데이트용)"""
+        owner, name = self.repo.split("/", 1)
+        aliases = "\n".join(
+            f"""i{number}: issue(number: {number}) {{
+                projectItems(first: 10) {{
+                  nodes {{
+                    id
+                    project {{
+                      id
+                      fields(first: 50) {{
+                        nodes {{
+                          ... on ProjectV2SingleSelectField {{ id name dataType options {{ id name }} }}
+                          ... on ProjectV2Field {{ id name dataType }}
+                        }}
+                      }}
+                    }}
+                  }}
+                }}
+              }}"""
+            for number in issue_numbers
+        )
+        query = """
+        query($owner: String!, $name: String!) {
+          repository(owner: $owner, name: $name) {
+            %s
+          }
+        }
+        """ % aliases
+        data = self._graphql(query, {"owner": owner, "name": name})
+        if data.get("errors"):
+            print(f"  ⚠ GraphQL 에러 (Projects 아이템 조회): {data['errors']}")
+        repository = (data.get("data") or {}).get("repository") or {}
+        return {
+            number: ((repository.get(f"i{number}") or {}).get("projectItems") or {}).get("nodes") or []
+            for number in issue_numbers
+        }
+
+    def _build_project_mutations(self, items: List[Dict], changes: Dict[str, Any]) -> List[str]:
+        """Projects 필드 변경을 updateProjectV2ItemFieldValue 뮤테이션들로 만듭니다"""
+        mutations = []
+        for item in items:
+            fields = {field["name"].lower(): field for field in item["project"]["fields"]["nodes"] if field}
+            for field_name, value in changes.items():
+                field = fields.get(field_name.lower())
+                if not field:
+                    continue
+                if value is None:
+                    mutations.append(
+                        f'clearProjectV2ItemFieldValue(input: {{projectId: "{item["project"]["id"]}", '
+                        f'itemId: "{item["id"]}", fieldId: "{field["id"]}"}}) {{ clientMutationId }}'
+                    )
+                    continue
+                if field.get("dataType") == "SINGLE_SELECT":
+                    option = next((o for o in field.get("options", []) if o["name"] == value), None)
+                    if not option:
+                        print(f"    ⚠ '{field_name}' 옵션 '{value}'이 프로젝트에 없습니다")
+                        continue
+                    field_value = f'{{singleSelectOptionId: "{option["id"]}"}}'
+                elif field.get("dataType") == "NUMBER":
+                    field_value = f"{{number: {float(value)}}}"
+                elif field.get("dataType") == "DATE":
+                    field_value = f"{{date: {json.dumps(str(value)[:10])}}}"
+                elif field.get("dataType") == "ITERATION":
+                    print(f"    ⚠ '{field_name}': Iteration 필드는 Notion에서 변경할 수 없습니다")
+                    continue
+                else:
+                    field_value = f"{{text: {json.dumps(str(value))}}}"
+                mutations.append(
+                    f'updateProjectV2ItemFieldValue(input: {{projectId: "{item["project"]["id"]}", '
+                    f'itemId: "{item["id"]}", fieldId: "{field["id"]}", value: {field_value}}}) '
+                    f'{{ clientMutationId }}'
+                )
+        return mutations
+
+    def back_sync(self) -> Dict[str, int]:
+        """Notion에서 바뀐 Status/Priority 등을 GitHub로 반영합니다 (last_edited_time 커서 이후만 조회)"""
+        cursors = self.state.section("back_sync_cursors")
+        cursor = cursors.get(self.repo)
+
+        filters: List[Dict] = [{"property": "Repository", "rich_text": {"equals": self.repo}}]
+        if cursor:
+            filters.append({"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": cursor}})
+
+        print(f"↩️  Notion → GitHub 역방향 동기화 (커서: {cursor or '처음'})")
+
+        rest_changes: Dict[int, Dict[str, Any]] = {}
+        project_changes: Dict[int, Dict[str, Any]] = {}
+        pending: Dict[int, tuple] = {}  # 이슈 번호 → (page_id, 새 기록 값)
+        latest = cursor
+        skipped = 0  # GitHub에 반영할 수 없는 변경 (잘못된 값, 거부된 요청)
+
+        try:
+            # 레포가 여러 데이터베이스로 나뉘어 있으면 모두 조회 (커서는 전체에서 가장 늦은 수정 시각)
+            pages = [page for database in self.router.candidates(self.repo)
+                     for page in self.iter_database_pages(
+                         {"and": filters}, sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+                         database=database)]
+        except requests.exceptions.RequestException as e:
+            print(f"  ✗ Notion 조회 실패: {e}")
+            return {"updated": 0, "failed": 1, "skipped": 0}
+
+        for page in pages:
+            latest = max(latest or "", page.get("last_edited_time", ""))
+            properties = page.get("properties", {})
+            number = read_notion_property(properties.get("Issue Number"))
+            if number is None or not self.in_shard(int(number)):
+                continue
+            values = {name: read_notion_property(find_notion_property(properties, name))
+                      for name in self.back_sync_properties}
+
+            with self.state.lock:
+                page_state = self.state.page(page["id"])
+                written = page_state.get("written")
+                if written is None:
+                    # 이 기능을 켜기 전에 만든 페이지: 현재 값을 기준으로 삼고 다음 변경부터 반영
+                    page_state["written"] = values
+                    continue
+
+            # 우리가 마지막으로 쓴 값과 다른 속성만 변경으로 간주 (자기 쓰기 되돌림 방지)
+            changed = {name: value for name, value in values.items() if written.get(name) != value}
+            if not changed:
+                continue
+
+            number = int(number)
+            pending[number] = (page["id"], values)
+            for name, value in changed.items():
+                target = self.back_sync_properties[name]
+                github_value = self.field_mapper.to_github_value(name, value)
+                if target == "state" and github_value not in ("open", "closed"):
+                    # GitHub가 422로 거부하는 값 (재시도해도 성공하지 않으므로 기록만 하고 커서는 진행)
+                    print(f"  ⚠ Issue #{number}: {name} '{value}'은(는) GitHub 이슈 상태(open/closed)가 아니어서 건너뜁니다")
+                    skipped += 1
+                    continue
+                if target.startswith("project:"):
+                    project_changes.setdefault(number, {})[target[len("project:"):]] = github_value
+                else:
+                    rest_changes.setdefault(number, {})[target] = github_value
+
+        updated, failed = 0, 0
+        succeeded = set(pending)
+        rejected = set()  # GitHub가 거부한 이슈 (기록만 하고 다시 시도하지 않음)
+
+        # 1. 이슈 상태/라벨 (REST, 이슈당 PATCH 한 번)
+        for number, payload in sorted(rest_changes.items()):
+            url = f"https://api.github.com/repos/{self.repo}/issues/{number}"
+            try:
+                response = self.session.patch(url, headers=self.github_headers, json=payload)
+                response.raise_for_status()
+                print(f"  ✓ Issue #{number} ← Notion: {payload}")
+            except requests.exceptions.RequestException as e:
+                status = getattr(e.response, "status_code", None)
+                if status in (404, 410, 422):
+                    # 삭제된 이슈나 GitHub가 거부한 값: 다시 시도해도 같으므로 건너뛰고 커서를 막지 않음
+                    print(f"  ⚠ Issue #{number} GitHub 업데이트 거부됨 ({status}), 건너뜁니다: {payload}")
+                    rejected.add(number)
+                    continue
+                print(f"  ✗ Issue #{number} GitHub 업데이트 실패: {e}")
+                succeeded.discard(number)
+
+        # 2. Projects 필드 (GraphQL 뮤테이션을 묶어서 실행)
+        if project_changes:
+            try:
+                items_by_issue = self.get_project_items_for_update(sorted(project_changes))
+                mutations = []
+                for number, changes in sorted(project_changes.items()):
+                    if not items_by_issue.get(number):
+                        print(f"    ⚠ Issue #{number}: 프로젝트 아이템이 없어 {list(changes)} 변경을 건너뜁니다")
+                        continue
+                    issue_mutations = self._build_project_mutations(items_by_issue[number], changes)
+                    mutations.extend((number, m) for m in issue_mutations)
+                for start in range(0, len(mutations), 20):
+                    chunk = mutations[start:start + 20]
+                    body = "\n".join(f"m{idx}: {m}" for idx, (_, m) in enumerate(chunk))
+                    data = self._graphql(f"mutation {{\n{body}\n}}", {})
+                    if data.get("errors"):
+                        print(f"  ⚠ GraphQL 에러 (Projects 필드 업데이트): {data['errors']}")
+                        succeeded.difference_update(number for number, _ in chunk)
+                for number, changes in sorted(project_changes.items()):
+                    if number in succeeded:
+                        print(f"  ✓ Issue #{number} ← Notion (Projects): {changes}")
+            except requests.exceptions.RequestException as e:
+                print(f"  ✗ Projects 필드 업데이트 실패: {e}")
+                succeeded.difference_update(project_changes)
+
+        # 3. 성공한 페이지는 현재 값을 "쓴 값"으로 기록 → 다음 정방향 동기화가 되돌아오지 않음
+        with self.state.lock:
+            for number, (page_id, values) in pending.items():
+                if number in succeeded:
+                    self.state.page(page_id)["written"] = values
+                    if number in rejected:
+                        skipped += 1
+                    elif number in rest_changes or number in project_changes:
+                        updated += 1
+                else:
+                    failed += 1
+            # 실패한 변경이 있으면 커서를 옮기지 않아 다음 실행에서 다시 시도
+            if not failed and latest:
+                cursors[self.repo] = latest
+
+        print(f"↩️  역방향 동기화: GitHub 반영 {updated}개, 실패 {failed}개"
+              + (f", 건너뜀 {skipped}개" if skipped else ""))
+        return {"updated": updated, "failed": failed, "skipped": skipped}
+
+    @staticmethod
+    def _audit_values(properties: Dict[str, Optional[Dict]]) -> Dict[str, Any]:
+        """비교용으로 정규화한 속성 값 (보낸 payload와 Notion 응답의 표현 차이 제거)"""
+        values = {}
+        for name, prop in properties.items():
+            value = read_notion_property(prop)
+            kind = (prop or {}).get("type") or next((key for key in prop or {} if key != "id"), None)
+            if kind == "date" and value:
+                value = value[:10]
+            elif kind in ("people", "relation"):
+                value = sorted(item["id"] for item in value or [])
+            elif kind == "number" and value is not None:
+                value = float(value)
+            values[name] = value
+        return values
+
+    def audit(self, repair: bool = False) -> Dict[str, Any]:
+        """GitHub 이슈 목록과 Notion 페이지를 한 번씩 통째로 읽어 메모리에서 비교합니다
+
+        페이지 누락/중복, 대상 데이터베이스, 필드 매핑 속성(Projects 필드와 마일스톤 relation 제외),
+        본문(마지막으로 쓴 본문 원문의 해시)을 비교하며, repair면 어긋난 이슈만 다시 씁니다.
+        """
+        print(f"🔍 감사: {self.repo}")
+        with self.tracer.span("audit.github", "phase", repo=self.repo):
+            issues = {issue.number: issue for issue in self.get_github_issues()}
+
+        # Notion 스냅샷 (데이터베이스마다 레포 페이지를 한 번씩 조회, repair는 이 인덱스로 검색 없이 씀)
+        pages: Dict[int, List[Tuple[NotionDatabase, Dict]]] = {}
+        with self.tracer.span("audit.notion", "phase", repo=self.repo):
+            for database in self.router.candidates(self.repo):
+                self.load_schema(database)
+                self.load_people(database)
+                index: Dict[int, str] = {}
+                for page in self.iter_database_pages(
+                        {"property": "Repository", "rich_text": {"equals": self.repo}}, database=database):
+                    number = read_notion_property(page.get("properties", {}).get("Issue Number"))
+                    if number is None or not self.in_shard(int(number)):
+                        continue
+                    pages.setdefault(int(number), []).append((database, page))
+                    index.setdefault(int(number), page["id"])
+                with database.lock:
+                    database.pages[self.repo] = index
+        print(f"  GitHub 이슈 {len(issues)}개, Notion 페이지 {sum(len(found) for found in pages.values())}개")
+
+        drift: Dict[int, List[str]] = {}
+        for number, issue in sorted(issues.items()):
+            found = pages.get(number)
+            if not found:
+                drift[number] = ["missing"]
+                continue
+            reasons = ["duplicate"] if len(found) > 1 else []
+            database, page = found[0]
+            if not self.router.uses_projects and self.router.route(issue) is not database:
+                reasons.append("database")
+            expected = self._audit_values(database.filter_properties(
+                self.field_mapper.build(issue, for_update=True, people=self.people)))
+            actual = self._audit_values({name: page["properties"].get(name) for name in expected})
+            reasons.extend(name for name in expected if expected[name] != actual[name])
+            with self.state.lock:
+                source = self.state.page(page["id"]).get("body_source")
+            if source is not None and source != self._body_hash(issue.body):
+                reasons.append("body")  # 기록이 없는 페이지(이 기능 이전에 쓴 페이지)는 비교하지 않음
+            if reasons:
+                drift[number] = reasons
+        orphans = sorted(set(pages) - set(issues))
+
+        kinds: Dict[str, int] = {}
+        for reasons in drift.values():
+            for reason in reasons:
+                kinds[reason] = kinds.get(reason, 0) + 1
+        print(f"  어긋난 이슈: {len(drift)}개" + (f" ({', '.join(f'{k} {v}' for k, v in sorted(kinds.items()))})"
+                                               if kinds else ""))
+        for number, reasons in list(drift.items())[:20]:
+            print(f"    #{number}: {', '.join(reasons)}")
+        if len(drift) > 20:
+            print(f"    ... 외 {len(drift) - 20}개")
+        if orphans:
+            print(f"  GitHub에 없는 이슈의 페이지: {len(orphans)}개 (삭제/이전된 이슈, 수정하지 않음)")
+
+        repaired, repair_failed = 0, 0
+        # 중복만 있는 이슈는 어느 페이지를 남길지 정할 수 없으므로 보고만 함
+        targets = [issues[number] for number, reasons in drift.items() if reasons != ["duplicate"]]
+        if repair and targets:
+            print(f"  🔧 {len(targets)}개 이슈 다시 쓰는 중...")
+            if self.needs_projects:
+                projects_by_node = self.get_projects_info_batch(targets)
+                for issue in targets:
+                    issue.projects = projects_by_node.get(issue.node_id, {})
+            self.use_page_index = True
+            try:
+                for issue in targets:
+                    with self.tracer.span("audit.repair", "phase", repo=self.repo, issue=issue.number):
+                        result = self.write_issue(issue, self.convert_body_to_blocks(issue.body))
+                    if result == "failed":
+                        repair_failed += 1
+                    else:
+                        repaired += 1
+                        self._mark_synced(issue)
+            finally:
+                self.use_page_index = False
+            print(f"  🔧 다시 씀: {repaired}개" + (f", 실패 {repair_failed}개" if repair_failed else ""))
+
+        return {"issues": len(issues), "pages": sum(len(found) for found in pages.values()),
+                "drifted": len(drift), "drift": {str(number): reasons for number, reasons in drift.items()},
+                "orphans": orphans, "repaired": repaired, "repair_failed": repair_failed}
+
+    def _poll_get(self, url: str, params: Dict[str, Any], poll_state: Dict[str, Any],
+                  key: str) -> Optional[requests.Response]:
+        """ETag 조건부 GET (304 Not Modified면 None, GitHub rate limit을 쓰지 않음)"""
+        headers = dict(self.github_headers)
+        if poll_state.get(key):
+            headers["If-None-Match"] = poll_state[key]
+        response = self.session.get(url, headers=headers, params=params)
+        hint = response.headers.get("X-Poll-Interval")
+        if hint:
+            self.poll_interval_hint = max(self.poll_interval_hint, int(hint))
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        if response.headers.get("ETag"):
+            poll_state[key] = response.headers["ETag"]
+        return response
+
+    def poll_changes(self) -> Dict[int, Tuple[Optional[Dict], set]]:
+        """마지막 확인 이후 바뀐 이슈를 모읍니다 (이슈 번호 → (이슈 REST 데이터 또는 None, 변경 출처))
+
+        이슈 이벤트 피드(닫기/라벨/이전 등)와 updated_at 기준 이슈 목록은 ETag 조건부로, Projects는 프로젝트의
+        updatedAt이 바뀐 경우에만 아이템을 조회합니다. 처음 실행하면 기준점만 기록하고 빈 결과를 반환합니다.
+        """
+        with self.state.lock:
+            poll_state = self.state.section("poll").setdefault(self.repo, {})
+        baseline = not poll_state
+        changes: Dict[int, Tuple[Optional[Dict], set]] = {}
+
+        def add(number: int, data: Optional[Dict], source: str):
+            if not self.in_shard(number):
+                return
+            previous, sources = changes.get(number, (None, set()))
+            changes[number] = (data or previous, sources | {source})
+
+        # 1. 이슈 이벤트 피드 (최신순, 마지막으로 본 이벤트 ID까지만)
+        events_url = f"https://api.github.com/repos/{self.repo}/issues/events"
+        response = self._poll_get(events_url, {"per_page": 100}, poll_state, "events_etag")
+        if response is not None:
+            last_id = poll_state.get("last_event_id", 0)
+            batch, page, newest = response.json(), 1, last_id
+            while True:
+                fresh = [event for event in batch if event["id"] > last_id]
+                for event in fresh:
+                    newest = max(newest, event["id"])
+                    issue = event.get("issue") or {}
+                    if issue and "pull_request" not in issue:
+                        add(issue["number"], None, event.get("event", "event"))
+                if not last_id or len(fresh) < len(batch) or len(batch) < 100 or page >= 10:
+                    break
+                page += 1
+                more = self.session.get(events_url, headers=self.github_headers,
+                                        params={"per_page": 100, "page": page})
+                more.raise_for_status()
+                batch = more.json()
+            poll_state["last_event_id"] = newest
+
+        # 2. updated_at이 바뀐 이슈 (제목/본문 수정 등 이벤트 피드에 없는 변경)
+        issues_url = f"https://api.github.com/repos/{self.repo}/issues"
+        since = poll_state.get("since")
+        if since:
+            params = {"state": "all", "since": since, "sort": "updated", "direction": "asc", "per_page": 100}
+            response = self._poll_get(issues_url, params, poll_state, "issues_etag")
+            if response is not None:
+                for data in response.json():
+                    since = max(since, data["updated_at"])
+                    if "pull_request" not in data:
+                        add(data["number"], data, "updated")
+        poll_state["since"] = since or datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        # 3. Projects 아이템 변경 (이슈 updated_at이 바뀌지 않음)
+        if self.poll_projects:
+            self._poll_projects(poll_state, add)
+
+        if baseline:
+            return {}
+        # 이미 같은 updated_at으로 반영한 이슈는 다시 쓰지 않음 (이벤트 실행이 먼저 처리한 경우 등)
+        synced = self.state.section("synced").get(self.repo, {})
+        return {number: (data, sources) for number, (data, sources) in changes.items()
+                if not (sources == {"updated"} and (synced.get(str(number)) or [None])[0] == data["updated_at"])}
+
+    def _poll_projects(self, poll_state: Dict[str, Any], add: Callable[[int, Optional[Dict], str], None]):
+        """레포에 연결된 Projects 중 updatedAt이 바뀐 프로젝트에서 그 뒤에 수정된 아이템의 이슈를 찾습니다"""
+        owner, name = self.repo.split("/", 1)
+        query = """
+        query($owner: String!, $name: String!) {
+          repository(owner: $owner, name: $name) {
+            projectsV2(first: 20) { nodes { id updatedAt } }
+          }
+%s
+        }
+        """ % RATE_LIMIT_SELECTION
+        data = self._graphql(query, {"owner": owner, "name": name})
+        repository = (data.get("data") or {}).get("repository") or {}
+        seen = poll_state.setdefault("projects", {})
+        for project in (repository.get("projectsV2") or {}).get("nodes") or []:
+            previous = seen.get(project["id"])
+            seen[project["id"]] = project["updatedAt"]
+            if previous is None or previous == project["updatedAt"]:
+                continue  # 처음 보는 프로젝트는 기준점만 기록
+            for item in self._iter_project_items(project["id"]):
+                content = item.get("content") or {}
+                if (item.get("updatedAt", "") > previous and content.get("number")
+                        and (content.get("repository") or {}).get("nameWithOwner") == self.repo):
+                    add(content["number"], None, "project")
+
+    def _iter_project_items(self, project_id: str) -> Iterable[Dict]:
+        """프로젝트 아이템의 updatedAt과 이슈 번호를 100개씩 가져옵니다 (아이템은 수정 시각 정렬을 지원하지 않음)"""
+        query = """
+        query($id: ID!, $after: String) {
+          node(id: $id) {
+            ... on ProjectV2 {
+              items(first: 100, after: $after) {
+                pageInfo { hasNextPage endCursor }
+                nodes {
+                  updatedAt
+                  content { ... on Issue { number repository { nameWithOwner } } }
                 }
+              }
             }
+          }
+%s
         }
-        
-        # Assignee 업데이트 (있는 경우)
-        if issue.get("assignee"):
-            data["properties"]["Assignee"] = {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": issue["assignee"]["login"]
-                        }
-                    }
-                ]
-            }
-        
-        # Milestone 업데이트 (있는 경우)
-        if issue.get("milestone"):
-            data["properties"]["Milestone"] = {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": issue["milestone"]["title"]
-                        }
-                    }
-                ]
-            }
-        
-        # Repository 업데이트
-        data["properties"]["Repository"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": self.repo
-                    }
-                }
-            ]
-        }
-        
-        # Projects V2 정보 업데이트
-        projects_info = self.get_issue_projects_info(issue)
-        if projects_info:
-            # Project 이름
-            if projects_info.get("project_title"):
-                data["properties"]["Project"] = {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": projects_info["project_title"]
-                            }
-                        }
-                    ]
-                }
-            
-            # Projects 필드들
-            fields = projects_info.get("fields", {})
-            
-            # Status (Backlog, Ready, In progress, In review, Done)
-            if "Status" in fields:
-                data["properties"]["Project Status"] = {
-                    "select": {
-                        "name": fields["Status"]
-                    }
-                }
-            
-            # Priority
-            if "Priority" in fields:
-                data["properties"]["Priority"] = {
-                    "select": {
-                        "name": fields["Priority"]
-                    }
-                }
-            
-            # Size
-            if "Size" in fields:
-                data["properties"]["Size"] = {
-                    "select": {
-                        "name": fields["Size"]
-                    }
-                }
-            
-            # Story Points (Number)
-            if "Story Points" in fields:
-                data["properties"]["Story Points"] = {
-                    "number": fields["Story Points"]
-                }
-            
-            # Capacity (Number)
-            if "Capacity" in fields:
-                data["properties"]["Capacity"] = {
-                    "number": fields["Capacity"]
-                }
-            
-            # Sprint (Iteration)
-            sprint_field_names = ["Sprint", "Iteration"]
-            for sprint_field in sprint_field_names:
-                if sprint_field in fields:
-                    data["properties"]["Sprint"] = {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": str(fields[sprint_field])
-                                }
-                            }
-                        ]
-                    }
-            
-            # Date 필드들 (Start date, Target date, Due date 등)
-            # Date 타입 필드는 자동으로 감지하여 추가
-            date_field_names = ["Start date", "Target date", "Due date", "Start Date", "Target Date", "Due Date"]
-            for date_field in date_field_names:
-                if date_field in fields:
-                    data["properties"][date_field] = {
-                        "date": {
-                            "start": fields[date_field]
-                        }
-                    }
-        
-        try:
-            # 1. 페이지 속성 업데이트
-            response = requests.patch(url, headers=self.notion_headers, json=data)
-            response.raise_for_status()
-            
-            # 2. 페이지 본문(블록) 업데이트
-            self.update_page_content(page_id, issue)
-            
-            print(f"  ✓ Issue #{issue['number']} 업데이트 완료: {issue['title']}")
-            return True
-        except requests.exceptions.RequestException as e:
-            print(f"  ✗ Issue #{issue['number']} 업데이트 실패: {e}")
-            if hasattr(e.response, 'text'):
-                print(f"    에러 상세: {e.response.text}")
-            return False
+        """ % RATE_LIMIT_SELECTION
+        after = None
+        while True:
+            data = self._graphql(query, {"id": project_id, "after": after})
+            items = (((data.get("data") or {}).get("node") or {}).get("items")) or {}
+            yield from items.get("nodes") or []
+            page_info = items.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return
+            after = page_info.get("endCursor")
 
-    def update_page_content(self, page_id: str, issue: Dict):
-        """페이지 본문(블록)을 업데이트합니다"""
-        try:
-            # 1. 기존 블록 가져오기
-            blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-            response = requests.get(blocks_url, headers=self.notion_headers)
-            response.raise_for_status()
-            existing_blocks = response.json().get("results", [])
-            
-            # 2. 기존 블록 삭제
-            for block in existing_blocks:
-                delete_url = f"https://api.notion.com/v1/blocks/{block['id']}"
-                requests.delete(delete_url, headers=self.notion_headers)
-            
-            # 3. 새 블록 추가
-            issue_body = issue.get("body", "")
-            new_blocks = self.convert_body_to_blocks(issue_body)
-            
-            append_data = {"children": new_blocks}
-            response = requests.patch(blocks_url, headers=self.notion_headers, json=append_data)
-            response.raise_for_status()
-            
-        except requests.exceptions.RequestException as e:
-            print(f"    ⚠ 본문 업데이트 실패 (속성은 업데이트됨): {e}")
+    def _enrich_stage(self, issues: List[Issue]) -> List[Issue]:
+        """[enrich] 이슈 묶음의 Projects 정보를 GraphQL 한 번으로 조회합니다"""
+        if not self.needs_projects or self.request_budget.exhausted():
+            return issues  # 매핑에 Projects 필드가 없거나 예산을 다 썼으면 (write에서 미룸) 조회 생략
+        with self.tracer.span("enrich", "phase", repo=self.repo, issues=len(issues)):
+            projects_by_node = self.get_projects_info_batch(issues)
+        for issue in issues:
+            issue.projects = projects_by_node.get(issue.node_id, {})
+        return issues
+
+    def _assets_stage(self, issue: Issue) -> List[tuple]:
+        """[assets] 본문의 첨부 파일을 Notion으로 미러링합니다 (느린 다운로드가 convert 단계를 막지 않도록 분리)"""
+        if self.request_budget.exhausted() or not issue.body:
+            return [(issue, None)]  # 예산을 다 썼으면 write 단계에서 미룸 (첨부 파일도 내려받지 않음)
+        return [(issue, self._mirror_body_assets(issue.body.split('\n')))]
+
+    def _convert_stage(self, item: tuple) -> List[tuple]:
+        """[convert] 이슈 본문을 Notion 블록으로 변환합니다 (첨부 파일은 assets 단계에서 미러링한 결과 사용)"""
+        issue, assets = item
+        if self.request_budget.exhausted():
+            return [(issue, None)]  # write 단계에서 다음 실행으로 미룸
+        with self.tracer.span("convert", "phase", repo=self.repo, issue=issue.number):
+            return [(issue, self.convert_body_to_blocks(issue.body, assets or {}))]
+
+    def write_issue(self, issue: Issue, blocks: Optional[List[Dict]] = None,
+                    database: Optional[NotionDatabase] = None) -> str:
+        """이슈 하나를 Notion에 반영합니다 ("created" / "updated" / "failed")"""
+        if issue.projects is None and self.router.uses_projects:
+            issue.projects = self.get_issue_projects_info(issue)  # Projects 규칙으로 라우팅하려면 먼저 필요
+        database = database or self.router.route(issue)
+        if issue.labels:
+            self.ensure_label_options(database, issue.labels)  # 보통은 캐시 확인만 (새 라벨이면 옵션 추가)
+        self.load_people(database)
+
+        # 대상 데이터베이스에 이미 존재하는지 확인 (Issue Number + Repository)
+        with self.tracer.span("notion.search", repo=self.repo, issue=issue.number):
+            page_id = self.find_page_in(database, issue.number)
+            if not page_id and len(self.router.candidates(self.repo)) > 1:
+                try:
+                    self.archive_moved_page(issue, database)
+                except requests.exceptions.RequestException as e:
+                    print(f"  ✗ Issue #{issue.number} 이전 데이터베이스 페이지 보관 실패: {e}")
+                    return "failed"
+
+        if page_id:
+            with self.tracer.span("notion.update", repo=self.repo, issue=issue.number):
+                return "updated" if self.update_notion_page(page_id, issue, blocks, database) else "failed"
+        with self.tracer.span("notion.create", repo=self.repo, issue=issue.number):
+            return "created" if self.create_notion_page(issue, blocks, database) else "failed"
+
+    def sync_issue(self, issue: Issue) -> str:
+        """이슈 하나만 동기화합니다 (목록 조회 없이 해당 이슈의 Projects 정보와 페이지만 조회)"""
+        with self.tracer.span("sync_issue", "phase", repo=self.repo, issue=issue.number):
+            if issue.projects is None and self.needs_projects:
+                issue.projects = self.get_issue_projects_info(issue)
+            return self.write_issue(issue, self.convert_body_to_blocks(issue.body))
+
+    def _route_stage(self, item: tuple) -> List[tuple]:
+        """[route] 이슈를 대상 데이터베이스의 쓰기 큐로 보냅니다 (큐가 차면 대기해 속도를 맞춤)"""
+        issue, blocks = item
+        database = self.router.route(issue)
+        self._writer(database).input.put((issue, blocks, database))
+        return []
+
+    def _writer(self, database: NotionDatabase) -> PipelineStage:
+        """데이터베이스별 쓰기 단계 (처음 쓰는 데이터베이스면 만들어 파이프라인에 붙임)"""
+        with self._writers_lock:
+            if database.id not in self._writers:
+                config = self.pipeline_config
+                writer = PipelineStage(f"write:{database.name}", self._write_stage, config["write_workers"],
+                                       queue_size=int(config["queue_size"]))
+                self._pipeline.add_sink(writer)
+                self._writers[database.id] = writer
+            return self._writers[database.id]
+
+    def _write_stage(self, item: tuple) -> List[tuple]:
+        """[write] Notion 페이지를 생성하거나 업데이트합니다"""
+        issue, blocks, database = item
+        if self.request_budget.exhausted():
+            self.defer_issue(issue.number, "budget")
+            with self._counts_lock:
+                self._counts["deferred"] += 1
+            return []
+        with self.tracer.span("write", "phase", repo=self.repo, issue=issue.number) as span:
+            result = self.write_issue(issue, blocks, database)
+            span.set(result=result)
+        if result != "failed":
+            self._mark_synced(issue)
+            if self.journal:
+                self.journal.record_issue(issue)
+        with self._counts_lock:
+            self._counts[result] += 1
+        return []
 
-    def sync(self):
+    def _skip_resumed(self, issues: List[Issue]) -> List[Issue]:
+        """재개한 실행: 이전 실행에서 반영한 뒤 바뀌지 않은 이슈는 건너뜀"""
+        if not self.journal or not self.journal.resumed:
+            return issues
+        pending = [issue for issue in issues if not self.journal.is_done(issue)]
+        with self._counts_lock:
+            self._counts["skipped"] += len(issues) - len(pending)
+        return pending
+
+    def issue_priority(self, issue: Issue) -> Tuple[int, int, float]:
+        """우선순위 정렬 키 (작을수록 먼저)
+
+        0: 이벤트로 요청됐지만 아직 반영하지 못한 이슈
+        1/2: 마지막 동기화 이후 바뀐 열린/닫힌 이슈 (최근 수정 순)
+        3: 바뀌지 않은 이슈 (Projects 값 갱신용, 가장 오래전에 동기화한 것부터, 열린 이슈 먼저)
+        """
+        number = str(issue.number)
+        deferred = self.state.section("deferred").get(self.repo, {}).get(number)
+        synced = self.state.section("synced").get(self.repo, {}).get(number)
+        if deferred and deferred.get("reason") == "event":
+            return 0, 0, -_timestamp(issue.updated_at)
+        if not synced or synced[0] != issue.updated_at:
+            return (1 if issue.state == "open" else 2), 0, -_timestamp(issue.updated_at)
+        return 3, (0 if issue.state == "open" else 1), _timestamp(synced[1])
+
+    def _mark_synced(self, issue: Issue):
+        """반영한 이슈의 updated_at과 동기화 시각을 기록합니다 (미뤄 둔 작업이면 목록에서 제거)"""
+        with self.state.lock:
+            self.state.section("synced").setdefault(self.repo, {})[str(issue.number)] = [
+                issue.updated_at, datetime.utcnow().isoformat() + "Z"]
+            self.state.section("deferred").get(self.repo, {}).pop(str(issue.number), None)
+
+    def defer_issue(self, issue_number: int, reason: str):
+        """이슈를 다음 실행으로 미룹니다 (reason: "budget" = 예산 소진, "event" = 이벤트 동기화 실패/보류)"""
+        with self.state.lock:
+            deferred = self.state.section("deferred").setdefault(self.repo, {})
+            entry = deferred.setdefault(str(issue_number), {"since": datetime.utcnow().isoformat() + "Z"})
+            if entry.get("reason") != "event":  # 이벤트로 요청된 이슈는 계속 최우선
+                entry["reason"] = reason
+
+    def build_pipeline(self, first_page: Optional[List[Issue]]) -> Pipeline:
+        """fetch → enrich → assets → convert → route → write:<데이터베이스> 파이프라인을 구성합니다
+
+        first_page가 None이면 이슈를 이미 다 가져와 정렬한 경우이므로 enrich 단계부터 시작합니다.
+        write 단계는 데이터베이스마다 따로 만들어지며 Notion rate limiter는 모두 공유합니다.
+        """
+        config = self.pipeline_config
+        queue_size = int(config["queue_size"])
+        pages = {1: first_page}  # 첫 페이지는 페이지 수 확인용으로 미리 가져옴
+
+        def fetch(page: int) -> List[Issue]:
+            if page in pages:
+                issues = pages.pop(page)
+            else:
+                with self.tracer.span("fetch", "phase", repo=self.repo, page=page):
+                    issues = self._fetch_issue_page(page)[0]
+            return self._skip_resumed(issues)
+
+        stages = [
+            PipelineStage("fetch", fetch, config["fetch_workers"], queue_size=queue_size),
+            PipelineStage("enrich", self._enrich_stage, config["enrich_workers"],
+                          batch_size=config["enrich_batch_size"], queue_size=queue_size),
+            PipelineStage("assets", self._assets_stage, config["asset_workers"], queue_size=queue_size),
+            PipelineStage("convert", self._convert_stage, config["convert_workers"], queue_size=queue_size),
+            PipelineStage("route", self._route_stage, 1, queue_size=queue_size),
+        ]
+        if first_page is None:
+            stages = stages[1:]
+        with self._writers_lock:
+            self._writers = {}
+        self._pipeline = Pipeline(stages)
+        return self._pipeline
+
+    def _sync_comments_after_write(self) -> int:
+        """코멘트 동기화 (페이지 생성/업데이트 이후, 실패한 이슈 수 반환)"""
+        if self.sync_comments_enabled and self.request_budget.exhausted():
+            print("ℹ️  요청 예산을 다 써서 코멘트 동기화는 다음 실행으로 미룹니다.")
+        elif self.sync_comments_enabled:
+            with self.tracer.span("comments", "phase", repo=self.repo):
+                return self.sync_comments()
+        return 0
+
+    def sync(self) -> Dict[str, int]:
         """GitHub Issues를 Notion으로 동기화합니다"""
         print("=" * 60)
         print("GitHub → Notion 이슈 동기화 시작")
         print("=" * 60)
         print(f"Repository: {self.repo}")
         print(f"Notion Database ID: {self.notion_database_id[:8]}...")
+        targets = self.router.candidates(self.repo)
+        if targets != [self.router.default]:
+            print(f"대상 데이터베이스: {', '.join(database.name for database in targets)}")
+        if self.shard:
+            print(f"Shard: {self.shard[0]}/{self.shard[1]} (이슈 기준)")
         print()
         
-        # GitHub Issues 가져오기
-        issues = self.get_github_issues()
+        self._counts = {"created": 0, "updated": 0, "failed": 0, "skipped": 0, "deferred": 0}
+        self._counts_lock = threading.Lock()
+        
+        # Notion에서 바뀐 값을 먼저 GitHub에 반영해야 정방향 동기화가 덮어쓰지 않음
+        if self.back_sync_enabled:
+            with self.tracer.span("back_sync", "phase", repo=self.repo):
+                self.back_sync()
+            print()
+        
+        # 첫 페이지로 전체 페이지 수 확인
+        try:
+            with self.tracer.span("fetch", "phase", repo=self.repo, page=1):
+                first_issues, last_page = self._fetch_issue_page(1)
+        except requests.exceptions.RequestException as e:
+            print(f"✗ GitHub API 호출 실패: {e}")
+            raise  # 이 레포만 실패로 처리 (다른 레포와 체크포인트는 유지)
         
-        if not issues:
+        if not first_issues and last_page <= 1:
             print("동기화할 이슈가 없습니다.")
-            return
+            return {"created": 0, "updated": 0, "failed": 0, "total": 0, "skipped": 0, "deferred": 0,
+                    "failed_pages": 0, "pipeline": {}}
         
-        print(f"\n동기화 진행 중...")
+        print(f"\n동기화 진행 중... (이슈 페이지 {last_page}개)")
         print("-" * 60)
         
-        created_count = 0
-        updated_count = 0
-        failed_count = 0
+        if self.prioritize:
+            # 목록을 모두 가져와 우선순위 순서로 정렬한 뒤 enrich 단계부터 실행 (예산이 떨어지면 나머지는 미룸)
+            issues = list(first_issues)
+            with self.tracer.span("fetch", "phase", repo=self.repo, pages=last_page - 1):
+                for page_issues in self._fetch_issue_pages(range(2, last_page + 1)):
+                    issues.extend(page_issues)
+            issues = sorted(self._skip_resumed(issues), key=self.issue_priority)
+            if self.request_budget.limited:
+                print(f"우선순위 순서로 동기화 (요청 예산 {self.request_budget.used}/{self.request_budget.max_requests} 사용)")
+            pipeline = self.build_pipeline(None)
+            items: Iterable = issues
+        else:
+            pipeline = self.build_pipeline(first_issues)
+            items = range(1, last_page + 1)
+        # 이번 실행의 페이지 인덱스는 새로 불러옴 (이벤트 동기화 등 다른 실행이 만든 페이지 반영)
+        for database in self.router.candidates(self.repo):
+            database.forget(self.repo)
+        # 레포 라벨을 먼저 옵션으로 추가 (데이터베이스마다 스키마 수정 한 번, 이슈별 수정 없음)
+        self._label_colors = None
+        if self.field_mapper.label_properties() and not self.request_budget.exhausted():
+            try:
+                labels = list(self.get_label_colors())
+            except requests.exceptions.RequestException as e:
+                print(f"⚠ 라벨 목록 조회 실패 (이슈별로 옵션 확인): {e}")
+                labels = []
+            for database in self.router.candidates(self.repo):
+                self.ensure_label_options(database, labels)
+        for database in self.router.candidates(self.repo):
+            self.load_people(database)  # 쓰기 워커가 기다리지 않도록 미리 불러옴
+        if self.router.milestones and not self.request_budget.exhausted():
+            self._milestones_checked = set()
+            self.sync_milestones()  # 레포당 한 번: 이후 이슈 쓰기는 인덱스에서 relation을 찾음
+        self.use_page_index = True
+        try:
+            with self.tracer.span("pipeline", repo=self.repo, pages=last_page):
+                self.pipeline_stats = pipeline.run(items)
+            comments_failed = self._sync_comments_after_write()
+        finally:
+            self.use_page_index = False
         
-        for issue in issues:
-            # Notion에 이미 존재하는지 확인 (Issue Number + Repository)
-            page_id = self.search_notion_page_by_issue_number(issue["number"], self.repo)
-            
-            if page_id:
-                # 업데이트
-                if self.update_notion_page(page_id, issue):
-                    updated_count += 1
-                else:
-                    failed_count += 1
-            else:
-                # 새로 생성
-                if self.create_notion_page(issue):
-                    created_count += 1
-                else:
-                    failed_count += 1
+        created_count = self._counts["created"]
+        updated_count = self._counts["updated"]
+        # 단계 자체에서 실패한 이슈(Projects 조회/변환 실패 등)도 실패로 집계
+        failed_count = self._counts["failed"] + sum(
+            stat["failed"] for name, stat in self.pipeline_stats.items() if name != "fetch"
+        )
+        # 조회에 실패한 페이지는 이슈 수를 알 수 없으므로 레포 단위 실패로 보고 (sync_all이 실패한 레포로 처리)
+        failed_pages = self.pipeline_stats.get("fetch", {}).get("failed", 0)
+        total = created_count + updated_count + failed_count
         
         # 결과 출력
         print()
@@ -965,8 +3751,293 @@ class GitHubNotionSync:
         print(f"생성됨: {created_count}개")
         print(f"업데이트됨: {updated_count}개")
         print(f"실패: {failed_count}개")
-        print(f"총 처리: {len(issues)}개")
+        print(f"총 처리: {total}개")
+        if self._counts["skipped"]:
+            print(f"건너뜀 (체크포인트에서 완료): {self._counts['skipped']}개")
+        if self._counts["deferred"]:
+            print(f"다음 실행으로 미룸 (요청 예산 소진): {self._counts['deferred']}개")
+        if comments_failed:
+            print(f"코멘트 동기화 실패: {comments_failed}개 이슈 (다음 실행에서 재시도)")
+        if failed_pages:
+            print(f"✗ GitHub 이슈 페이지 조회 실패: {failed_pages}개 (해당 페이지의 이슈는 동기화되지 않음)")
+        print("-" * 60)
+        pipeline.print_stats()
+        graphql_stats = self.graphql_budget.stats()
+        if graphql_stats["queries"]:
+            print(f"GraphQL: 쿼리 {graphql_stats['queries']}개, 비용 {graphql_stats['cost']}점, "
+                  f"남은 포인트 {graphql_stats['remaining']}/{graphql_stats['limit']}, "
+                  f"한도 대기 {graphql_stats['paused_seconds']}초")
         print("=" * 60)
+        
+        return {"created": created_count, "updated": updated_count, "failed": failed_count, "total": total,
+                "skipped": self._counts["skipped"], "deferred": self._counts["deferred"],
+                "failed_pages": failed_pages, "pipeline": self.pipeline_stats, "graphql": graphql_stats}
+
+
+class SyncEngine:
+    """여러 번의 동기화 호출에서 HTTP 세션, rate limiter, 레포별 캐시를 재사용하는 라이브러리 API
+
+    사용 예 (서버리스 webhook 핸들러에서 엔진 하나를 계속 재사용):
+        engine = SyncEngine(notion_api_key, notion_database_id, github_token=token, config=config)
+        engine.sync_issue("owner/repo", 42)
+        engine.sync_repo("owner/repo")
+        engine.sync_all(["owner/repo", "owner/other"])
+    """
+
+    def __init__(self, notion_api_key: str, notion_database_id: str, github_token: Optional[str] = None,
+                 config: Optional[Dict] = None, state: Optional[SyncState] = None,
+                 journal: Optional[SyncJournal] = None, tracer: Optional[Tracer] = None,
+                 max_requests: Optional[int] = None):
+        self.notion_api_key = notion_api_key
+        self.notion_database_id = notion_database_id
+        self.github_token = github_token or os.environ.get('GITHUB_TOKEN')
+        self.config = config or {}
+        self.state = state or SyncState()
+        self.journal = journal  # sync_all의 체크포인트 (없으면 기록하지 않음)
+        self.tracer = tracer or Tracer()  # 기본은 꺼짐
+        # 실행당 요청 예산 (인자 > config.yml의 budget.max_requests, 모든 레포 합계)
+        self.request_budget = RequestBudget(max_requests or (self.config.get('budget') or {}).get('max_requests'))
+
+        self.pipeline_config = load_pipeline_config(self.config)
+        # Notion rate limit은 통합(Integration) 단위이므로 모든 레포가 공유
+        self.notion_limiter = RateLimiter(self.pipeline_config["notion_rate_limit"])
+        # GitHub GraphQL 포인트 한도도 토큰 단위이므로 공유
+        self.graphql_budget = GraphQLBudget(self.pipeline_config["graphql_reserve"],
+                                            self.pipeline_config["graphql_max_query_cost"])
+        # 첨부 파일 캐시와 다운로드 워커도 레포 간 공유 (같은 파일을 여러 이슈가 참조해도 한 번만 조회)
+        self.asset_mirror = AssetMirror(self.state, (self.config.get('assets') or {}).get('workers', 4))
+        self.field_mapper = FieldMapper.from_config(self.config)  # 실행당 한 번 컴파일
+        # 대상 데이터베이스별 스키마/페이지 인덱스 캐시도 레포 간 공유 (여러 레포가 한 데이터베이스로 갈 수 있음)
+        self.router = DatabaseRouter.from_config(notion_database_id, self.config)
+        self.people = PeopleDirectory.from_config(self.state, self.config)  # 사용자 디렉터리도 한 번만 조회
+        self._session: Optional[requests.Session] = None
+        self._syncers: Dict[Tuple[str, Optional[Tuple[int, int]]], GitHubNotionSync] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """공유 HTTP 세션 (처음 사용할 때 생성)"""
+        if self._session is None:
+            self._session = create_http_session(self.pipeline_config, self.tracer, self.request_budget)
+        return self._session
+
+    def syncer(self, repo: str, shard: Optional[Tuple[int, int]] = None) -> GitHubNotionSync:
+        """레포별 동기화 객체를 반환합니다 (한 번 만든 객체와 캐시는 재사용)"""
+        key = (repo, shard)
+        with self._lock:
+            if key not in self._syncers:
+                self._syncers[key] = GitHubNotionSync(
+                    repo, self.notion_api_key, self.notion_database_id,
+                    config=self.config, notion_limiter=self.notion_limiter, state=self.state,
+                    shard=shard, github_token=self.github_token, session=self.session,
+                    field_mapper=self.field_mapper, journal=self.journal, graphql_budget=self.graphql_budget,
+                    asset_mirror=self.asset_mirror, tracer=self.tracer, request_budget=self.request_budget,
+                    router=self.router, people=self.people,
+                )
+            return self._syncers[key]
+
+    def sync_issue(self, repo: str, issue: Union[Issue, Dict, int],
+                   shard: Optional[Tuple[int, int]] = None) -> str:
+        """이슈 하나를 동기화합니다 (이슈 번호, GitHub REST 이슈 dict, Issue 모두 가능)
+
+        요청 예산을 다 썼거나 동기화에 실패하면 다음 전체 동기화에서 가장 먼저 처리하도록 미룹니다.
+        shard는 이 이슈를 맡은 샤드로, 마일스톤 페이지를 쓸지 정할 때 전체 동기화와 같은 기준을 씁니다.
+        """
+        syncer = self.syncer(repo, shard)
+        if self.request_budget.exhausted():
+            number = issue if isinstance(issue, int) else issue.number if isinstance(issue, Issue) else issue["number"]
+            syncer.defer_issue(number, "event")
+            print(f"ℹ️  요청 예산을 다 써서 {repo} Issue #{number}는 다음 실행으로 미룹니다.")
+            return "deferred"
+        if isinstance(issue, int):
+            fetched = syncer.get_github_issue(issue)
+            if fetched is None:
+                print(f"ℹ️  {repo} Issue #{issue}를 찾을 수 없습니다 (삭제되었거나 PR).")
+                return "skipped"
+            issue = fetched
+        elif isinstance(issue, dict):
+            issue = Issue.from_github(issue, repo)
+        result = syncer.sync_issue(issue)
+        if result == "failed":
+            syncer.defer_issue(issue.number, "event")
+        else:
+            syncer._mark_synced(issue)
+        return result
+
+    def sync_repo(self, repo: str, shard: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """레포 하나를 전체 동기화합니다"""
+        try:
+            with self.tracer.span("sync_repo", "repo", repo=repo):
+                return self.syncer(repo, shard).sync()
+        finally:
+            self.state.save()
+
+    def sync_all(self, repositories: List[str], shard: Optional[Tuple[int, int]] = None,
+                 shard_by: str = 'issue') -> Dict[str, Any]:
+        """여러 레포를 순서대로 동기화하고 실행 리포트를 반환합니다"""
+        issue_shard = None
+        if shard:
+            if shard_by == 'repo':
+                repositories = [repo for repo in repositories if shard_of(repo, shard[1]) == shard[0]]
+                print(f"🧩 Shard {shard[0]}/{shard[1]} (레포 기준): {len(repositories)}개 레포")
+            else:
+                issue_shard = shard
+                print(f"🧩 Shard {shard[0]}/{shard[1]} (이슈 기준)")
+            print()
+
+        report: Dict[str, Any] = {
+            "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+            "shard_by": shard_by if shard else None,
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "resumed": bool(self.journal and self.journal.resumed),
+            "repositories": {},
+            "failed_repositories": [],
+            "deferred_repositories": [],
+            "totals": {"created": 0, "updated": 0, "failed": 0, "total": 0, "deferred": 0},
+        }
+
+        for idx, repo in enumerate(repositories, 1):
+            print("=" * 70)
+            print(f"[{idx}/{len(repositories)}] 레포: {repo}")
+            print("=" * 70)
+
+            if self.journal and repo in self.journal.completed_repos:
+                print("⏭️  이전 실행에서 완료된 레포입니다 (체크포인트). 건너뜁니다.")
+                print()
+                continue
+
+            if self.request_budget.exhausted():
+                print("⏭️  요청 예산을 다 써서 이 레포는 다음 실행으로 미룹니다.")
+                print()
+                report["deferred_repositories"].append(repo)
+                continue
+
+            try:
+                result = self.sync_repo(repo, issue_shard)
+                report["repositories"][repo] = result
+                for key in report["totals"]:
+                    report["totals"][key] += result[key]
+                if result["failed_pages"]:
+                    # 일부 페이지를 못 가져온 레포는 완료로 기록하지 않음 (다음 실행에서 전체를 다시 확인)
+                    print(f"✗ 레포 {repo} 동기화 실패: 이슈 페이지 {result['failed_pages']}개 조회 실패")
+                    report["failed_repositories"].append(repo)
+                    continue
+                if self.journal and not result["failed"] and not result["deferred"]:
+                    self.journal.complete_repo(repo)  # 실패한 이슈가 있으면 재개 시 그 이슈만 다시 시도
+            except Exception as e:
+                print(f"✗ 레포 {repo} 동기화 실패: {e}")
+                report["failed_repositories"].append(repo)
+                import traceback
+                traceback.print_exc()
+                continue
+
+            print()
+
+        if (self.journal and not report["failed_repositories"] and not report["deferred_repositories"]
+                and not report["totals"]["failed"] and not report["totals"]["deferred"]):
+            self.journal.finish()
+        report["requests"] = self.request_budget.stats()
+        report["finished_at"] = datetime.utcnow().isoformat() + "Z"
+        return report
+
+    def audit_all(self, repositories: List[str], shard: Optional[Tuple[int, int]] = None,
+                  shard_by: str = 'issue', repair: bool = False) -> Dict[str, Any]:
+        """여러 레포의 GitHub ↔ Notion 차이를 검사하고 감사 리포트를 반환합니다"""
+        issue_shard = None
+        if shard:
+            if shard_by == 'repo':
+                repositories = [repo for repo in repositories if shard_of(repo, shard[1]) == shard[0]]
+            else:
+                issue_shard = shard
+
+        report: Dict[str, Any] = {
+            "command": "audit",
+            "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "repositories": {},
+            "failed_repositories": [],
+            "totals": {"issues": 0, "pages": 0, "drifted": 0, "orphans": 0, "repaired": 0, "repair_failed": 0},
+        }
+        for repo in repositories:
+            try:
+                result = self.syncer(repo, issue_shard).audit(repair=repair)
+            except Exception as e:
+                print(f"✗ 레포 {repo} 감사 실패: {e}")
+                report["failed_repositories"].append(repo)
+                continue
+            report["repositories"][repo] = result
+            for key in report["totals"]:
+                value = result[key]
+                report["totals"][key] += len(value) if isinstance(value, list) else value
+            print()
+        report["requests"] = self.request_budget.stats()
+        report["finished_at"] = datetime.utcnow().isoformat() + "Z"
+        return report
+
+    def poll(self, repositories: List[str], once: bool = False, duration: Optional[float] = None) -> Dict[str, int]:
+        """바뀐 이슈만 계속 확인해 동기화합니다 (변경이 없으면 간격을 늘리고, 있으면 최소 간격으로 되돌림)
+
+        once면 한 번만 확인하고, duration(초)이 지나면 끝냅니다. 확인할 때마다 상태 파일에 커서를 저장합니다.
+        요청 예산(budget.max_requests)은 확인 주기마다 다시 채우고, 예산이 모자라 미룬 이슈는 다음 주기에 다시 시도합니다.
+        """
+        poll_config = dict(DEFAULT_POLL_CONFIG, **(self.config.get('poll') or {}))
+        min_interval, max_interval = float(poll_config["min_interval"]), float(poll_config["max_interval"])
+        deadline = time.monotonic() + duration if duration else None
+        interval = min_interval
+        totals = {"cycles": 0, "dispatched": 0, "failed": 0, "deferred": 0}
+        pending: Dict[str, set] = {}  # 레포 → 예산 소진으로 미룬 이슈 번호
+        while True:
+            self.request_budget.reset()
+            dispatched = 0
+            for repo in repositories:
+                syncer = self.syncer(repo)
+                try:
+                    with self.tracer.span("poll", "phase", repo=repo):
+                        changes = syncer.poll_changes()
+                except requests.exceptions.RequestException as e:
+                    print(f"✗ {repo} 변경 확인 실패: {e}")
+                    changes = {}
+                for number in pending.pop(repo, set()):
+                    changes.setdefault(number, (None, {"deferred"}))
+                for number, (data, sources) in sorted(changes.items()):
+                    print(f"🔔 {repo} Issue #{number} ({', '.join(sorted(sources))})")
+                    try:
+                        result = self.sync_issue(repo, data or number)
+                    except requests.exceptions.RequestException as e:
+                        # 일시적인 GitHub/Notion 오류: poll은 계속하고 이 이슈만 다음 주기에 다시 시도
+                        print(f"  ✗ {repo} Issue #{number} 동기화 실패: {e}")
+                        syncer.defer_issue(number, "event")
+                        pending.setdefault(repo, set()).add(number)
+                        totals["failed"] += 1
+                        self.state.save()
+                        continue
+                    if result == "deferred":
+                        pending.setdefault(repo, set()).add(number)
+                        totals["deferred"] += 1
+                        continue
+                    dispatched += 1
+                    if result == "failed":
+                        totals["failed"] += 1
+            totals["cycles"] += 1
+            totals["dispatched"] += dispatched
+            self.state.save()
+
+            hint = max((syncer.poll_interval_hint for syncer in self._syncers.values()), default=0)
+            interval = min_interval if dispatched else min(max_interval, interval * 1.5)
+            interval = max(interval, hint)
+            if once or (deadline and time.monotonic() + interval > deadline):
+                return totals
+            time.sleep(interval)
+
+    def close(self):
+        """상태를 저장하고 저널 파일, 다운로드 워커, HTTP 세션을 닫습니다"""
+        self.asset_mirror.close()
+        self.state.save()
+        if self.journal:
+            self.journal.close()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 
 def load_config() -> Optional[Dict]:
@@ -1028,7 +4099,209 @@ def setup_github_token(config: Optional[Dict]) -> str:
     sys.exit(1)
 
 
-def main():
+# 해당 이슈만 동기화하는 이벤트 (그 외 schedule/workflow_dispatch 등은 전체 동기화)
+ISSUE_EVENTS = ("issues", "issue_comment")
+NO_OP_EVENT = object()  # 이슈/코멘트 이벤트지만 할 일이 없음 (PR 코멘트 등, 전체 동기화로 넘어가지 않음)
+
+
+def load_issue_event() -> Union[None, object, Tuple[str, Dict]]:
+    """GitHub Actions 이슈/코멘트 이벤트 payload를 읽습니다
+
+    이슈/코멘트 이벤트가 아니면 None(전체 동기화), 이슈/코멘트 이벤트지만 동기화할 이슈가 없으면 NO_OP_EVENT를
+    반환합니다. 이벤트 job은 샤드로 나뉘지 않으므로 PR 코멘트 하나로 전체 동기화가 돌지 않게 합니다.
+    """
+    event_name = os.environ.get('GITHUB_EVENT_NAME')
+    event_path = os.environ.get('GITHUB_EVENT_PATH')
+
+    if event_name not in ISSUE_EVENTS:
+        return None
+    if not event_path:
+        print("⚠ 이벤트 payload 경로(GITHUB_EVENT_PATH)가 없어 건너뜁니다.")
+        return NO_OP_EVENT
+
+    try:
+        with open(event_path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠ 이벤트 payload 로드 실패: {e}")
+        return NO_OP_EVENT
+
+    if not payload.get('issue'):
+        print(f"ℹ️  {event_name} 이벤트에 이슈 정보가 없어 건너뜁니다.")
+        return NO_OP_EVENT
+    if 'pull_request' in payload['issue']:
+        print("ℹ️  Pull Request 이벤트는 동기화하지 않습니다. 건너뜁니다.")
+        return NO_OP_EVENT
+    return event_name, payload
+
+
+def sync_issue_event(engine: SyncEngine, event_name: str, payload: Dict, repositories: List[str],
+                     shard: Optional[Tuple[int, int]] = None) -> bool:
+    """이슈/코멘트 이벤트 payload의 이슈 하나만 동기화합니다
+
+    shard(--shard, 이슈 기준)를 주면 그 샤드의 syncer로 처리하므로, 마일스톤 페이지는 전체 동기화와 같은
+    샤드 하나만 만듭니다 (나머지는 이미 있는 마일스톤 페이지만 연결).
+    """
+    repo = payload.get('repository', {}).get('full_name') or os.environ.get('GITHUB_REPOSITORY')
+    action = payload.get('action')
+    issue = Issue.from_github(payload['issue'], repo)
+
+    print("=" * 70)
+    print(f"⚡ 이벤트 동기화: {repo} Issue #{issue.number} ({event_name}.{action})")
+    print("=" * 70)
+
+    if repo not in repositories:
+        print(f"ℹ️  {repo}는 동기화 대상 레포가 아닙니다. 건너뜁니다.")
+        return True
+
+    if action == 'deleted':
+        print("ℹ️  삭제된 이슈/코멘트는 동기화하지 않습니다.")
+        return True
+
+    syncer = engine.syncer(repo, shard)
+    if not syncer.in_shard(issue.number):
+        print(f"ℹ️  Issue #{issue.number}는 Shard {shard[0]}/{shard[1]}에 속하지 않습니다. 건너뜁니다.")
+        return True
+
+    if event_name == 'issue_comment':
+        if not syncer.sync_comments_enabled:
+            print("ℹ️  코멘트 동기화가 꺼져 있습니다 (config.yml의 sync_comments).")
+            return True
+        page_id = syncer.find_issue_page(issue.number)
+        if not page_id:
+            # 페이지가 아직 없으면 이슈부터 만들고 코멘트는 다음 전체 동기화에서 추가
+            result = syncer.sync_issue(issue)
+        else:
+            try:
+                syncer.sync_page_comments(page_id, [Comment.from_github(payload['comment'])])
+                result = "updated"
+            except requests.exceptions.RequestException as e:
+                print(f"  ✗ 코멘트 동기화 실패: {e}")
+                result = "failed"
+    else:
+        result = engine.sync_issue(repo, issue, shard)
+
+    print("=" * 70)
+    print(f"결과: {result}")
+    print("=" * 70)
+    return result != "failed"
+
+
+def load_sync_state(config: Optional[Dict]) -> SyncState:
+    """동기화 상태 파일을 로드합니다 (config.yml의 state_file, 기본 .sync_state.json)"""
+    state_file = (config or {}).get('state_file') or '.sync_state.json'
+    return SyncState(Path(__file__).parent / state_file)
+
+
+def load_sync_journal(config: Optional[Dict], args: argparse.Namespace) -> SyncJournal:
+    """체크포인트 저널을 엽니다 (config.yml의 journal_file, 기본 .sync_journal.jsonl)"""
+    config = config or {}
+    journal_file = config.get('journal_file') or '.sync_journal.jsonl'
+    shard = f"{args.shard[0]}/{args.shard[1]}" if args.shard else "1/1"
+    return SyncJournal(Path(__file__).parent / journal_file,
+                       run_key=f"{shard}:{args.shard_by}", resume=args.resume,
+                       max_age_hours=float(config.get('journal_max_age_hours', 12)),
+                       max_resumes=int(config.get('journal_max_resumes', 6)))
+
+
+def write_run_report(path: str, report: Dict):
+    """실행 결과 리포트를 JSON으로 저장합니다 (샤드별 리포트는 merge-reports로 합침)"""
+    report_path = Path(path)
+    if report_path.parent:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📝 실행 리포트 저장: {report_path}")
+
+
+def merge_run_reports(paths: List[str], output: Optional[str] = None) -> Dict:
+    """샤드별 실행 리포트를 하나로 합쳐 요약을 출력합니다"""
+    merged: Dict[str, Any] = {"shards": [], "repositories": {},
+                              "totals": {"created": 0, "updated": 0, "failed": 0, "total": 0, "deferred": 0}}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        merged["shards"].append(report.get("shard") or "1/1")
+        for repo, result in report.get("repositories", {}).items():
+            repo_totals = merged["repositories"].setdefault(
+                repo, {"created": 0, "updated": 0, "failed": 0, "total": 0, "deferred": 0})
+            for key in repo_totals:
+                repo_totals[key] += result.get(key, 0)
+                merged["totals"][key] += result.get(key, 0)
+        for repo in report.get("failed_repositories", []):
+            if repo not in merged.setdefault("failed_repositories", []):
+                merged["failed_repositories"].append(repo)
+        for repo in report.get("deferred_repositories", []):
+            if repo not in merged.setdefault("deferred_repositories", []):
+                merged["deferred_repositories"].append(repo)
+
+    totals = merged["totals"]
+    print("=" * 70)
+    print(f"📊 샤드 리포트 합계 ({len(paths)}개: {', '.join(sorted(merged['shards']))})")
+    print("=" * 70)
+    for repo, result in sorted(merged["repositories"].items()):
+        print(f"  - {repo}: 생성 {result['created']} / 업데이트 {result['updated']} / 실패 {result['failed']}")
+    print(f"생성됨: {totals['created']}개 / 업데이트됨: {totals['updated']}개 / "
+          f"실패: {totals['failed']}개 (총 {totals['total']}개)")
+    if totals["deferred"]:
+        print(f"다음 실행으로 미룬 이슈: {totals['deferred']}개 (요청 예산 소진)")
+    if merged.get("deferred_repositories"):
+        print(f"⏭️  다음 실행으로 미룬 레포: {', '.join(merged['deferred_repositories'])}")
+    if merged.get("failed_repositories"):
+        print(f"✗ 동기화 실패한 레포: {', '.join(merged['failed_repositories'])}")
+    print("=" * 70)
+
+    if output:
+        write_run_report(output, merged)
+    return merged
+
+
+def finish_tracing(tracer: Tracer, profiler: Optional[SamplingProfiler], args: argparse.Namespace):
+    """추적 요약을 출력하고 추적 파일과 프로파일을 저장합니다"""
+    if profiler:
+        profiler.stop()
+        profiler.dump(args.profile)
+    if tracer.enabled:
+        tracer.print_summary()
+    if args.trace:
+        tracer.export(args.trace)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자를 파싱합니다"""
+    parser = argparse.ArgumentParser(description="GitHub Issues → Notion 동기화")
+    parser.add_argument('command', nargs='?', default='sync', choices=['sync', 'audit', 'poll', 'merge-reports'],
+                        help="sync: 동기화 실행 (기본값), audit: GitHub ↔ Notion 차이 검사, "
+                             "poll: 바뀐 이슈만 계속 확인해 동기화, merge-reports: 샤드별 리포트 합치기")
+    parser.add_argument('paths', nargs='*', help="merge-reports: 합칠 리포트 파일들")
+    parser.add_argument('--shard', type=parse_shard, metavar='i/n',
+                        help="n개로 나눈 작업 중 i번째만 동기화 (예: 1/4)")
+    parser.add_argument('--shard-by', choices=['issue', 'repo'], default='issue',
+                        help="샤드 기준: issue = (레포, 이슈 번호) 해시 (기본값), repo = 레포 이름 해시")
+    parser.add_argument('--resume', action='store_true',
+                        help="중단된 이전 실행의 체크포인트에서 이어서 동기화 (완료된 레포/이슈 건너뜀)")
+    parser.add_argument('--max-requests', type=int, metavar='N',
+                        help="실행당 최대 API 요청 수 (config.yml의 budget.max_requests보다 우선, 넘으면 나머지는 다음 실행으로)")
+    parser.add_argument('--report', metavar='FILE', help="실행 결과 리포트(JSON) 저장 경로")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="단계/API 호출 구간을 Chrome trace 형식(JSON)으로 저장 (chrome://tracing, Perfetto)")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="phase별 샘플링 프로파일을 DIR에 저장 (예: --profile profile)")
+    parser.add_argument('--repair', action='store_true', help="audit: 어긋난 이슈의 페이지만 다시 쓰기")
+    parser.add_argument('--once', action='store_true', help="poll: 한 번만 확인하고 끝내기")
+    parser.add_argument('--duration', type=float, metavar='SECONDS', help="poll: 이 시간(초)이 지나면 끝내기")
+    parser.add_argument('--output', metavar='FILE', help="merge-reports: 합친 리포트 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    if args.command == 'merge-reports':
+        merged = merge_run_reports(args.paths, args.output)
+        if merged["totals"]["failed"] or merged.get("failed_repositories"):
+            sys.exit(1)
+        return
+    
     print("=" * 70)
     print("GitHub Issues → Notion 동기화 시작")
     print("=" * 70)
@@ -1058,51 +4331,97 @@ def main():
     
     # 3. GitHub Token 설정
     github_token = setup_github_token(config)
-    os.environ['GITHUB_TOKEN'] = github_token  # 전역 설정
     
     # 4. 동기화할 레포 목록
     repositories = get_repositories_to_sync(config)
     print()
     
-    # 5. 각 레포 동기화
-    total_created = 0
-    total_updated = 0
-    total_failed = 0
-    total_issues = 0
+    # 동기화 엔진 (HTTP 세션, rate limiter, 실행 간 유지되는 상태를 공유)
+    # 추적/프로파일링 (프로파일러는 phase 구간으로 샘플을 분류하므로 추적도 함께 켬)
+    tracer = Tracer(enabled=bool(args.trace or args.profile))
+    profiler = SamplingProfiler(tracer) if args.profile else None
+    if profiler:
+        profiler.start()
     
-    for idx, repo in enumerate(repositories, 1):
+    engine = SyncEngine(notion_api_key, notion_database_id, github_token=github_token,
+                        config=config, state=load_sync_state(config), tracer=tracer,
+                        max_requests=args.max_requests)
+    
+    # 감사: 양쪽을 한 번씩 통째로 읽어 비교 (--repair면 어긋난 이슈만 다시 씀)
+    if args.command == 'audit':
+        report = engine.audit_all(repositories, shard=args.shard, shard_by=args.shard_by, repair=args.repair)
+        engine.close()
+        finish_tracing(tracer, profiler, args)
+        totals = report["totals"]
         print("=" * 70)
-        print(f"[{idx}/{len(repositories)}] 레포: {repo}")
+        print(f"🔍 감사 완료: 이슈 {totals['issues']}개 중 {totals['drifted']}개 어긋남, "
+              f"다시 씀 {totals['repaired']}개, 실패 {totals['repair_failed']}개")
+        print(f"API 요청: {report['requests']['used']}개")
         print("=" * 70)
-        
+        if args.report:
+            write_run_report(args.report, report)
+        remaining = totals["drifted"] - totals["repaired"] if args.repair else totals["drifted"]
+        if remaining or report["failed_repositories"]:
+            sys.exit(1)
+        return
+    
+    # poll: 이벤트 피드/Projects 변경을 계속 확인해 바뀐 이슈만 동기화 (Ctrl+C 또는 --duration으로 종료)
+    if args.command == 'poll':
+        print(f"🔁 변경 확인 시작: {', '.join(repositories)}")
         try:
-            # GitHubNotionSync 인스턴스 생성
-            syncer = GitHubNotionSync(repo, notion_api_key, notion_database_id)
-            
-            # 동기화 실행
-            syncer.sync()
-            
-            # 통계 수집 (간단하게 sync 메서드에서 반환하도록 수정 가능)
-            # 지금은 각 레포마다 출력만 함
-            
-        except Exception as e:
-            print(f"✗ 레포 {repo} 동기화 실패: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
-        
-        print()
+            totals = engine.poll(repositories, once=args.once, duration=args.duration)
+            print(f"🔁 변경 확인 {totals['cycles']}회, 동기화 {totals['dispatched']}개, 실패 {totals['failed']}개"
+                  + (f", 예산 소진으로 미룸 {totals['deferred']}번" if totals['deferred'] else ""))
+        except KeyboardInterrupt:
+            print("\n🔁 변경 확인을 중단합니다.")
+        engine.close()
+        finish_tracing(tracer, profiler, args)
+        return
+    
+    # 이슈 이벤트로 실행된 경우 해당 이슈만 동기화 (전체 동기화는 schedule/workflow_dispatch에서만)
+    event = load_issue_event()
+    if event is NO_OP_EVENT:
+        engine.close()
+        finish_tracing(tracer, profiler, args)
+        return
+    if event:
+        ok = sync_issue_event(engine, *event, repositories,
+                              shard=args.shard if args.shard_by == 'issue' else None)
+        engine.close()
+        finish_tracing(tracer, profiler, args)
+        if not ok:
+            sys.exit(1)
+        return
+    
+    # 5. 각 레포 동기화 (샤드 지정 시 이 실행이 맡은 부분만, 진행 상황은 저널에 체크포인트)
+    engine.journal = load_sync_journal(config, args)
+    report = engine.sync_all(repositories, shard=args.shard, shard_by=args.shard_by)
+    engine.close()
+    totals = report["totals"]
     
     # 6. 전체 요약
     print()
     print("=" * 70)
     print("🎉 전체 동기화 완료!")
     print("=" * 70)
-    print(f"동기화한 레포: {len(repositories)}개")
-    for repo in repositories:
+    print(f"동기화한 레포: {len(report['repositories'])}개")
+    for repo in report["repositories"]:
         print(f"  - {repo}")
+    if report["failed_repositories"]:
+        print(f"✗ 동기화 실패한 레포: {', '.join(report['failed_repositories'])}")
+    if report["deferred_repositories"]:
+        print(f"⏭️  다음 실행으로 미룬 레포: {', '.join(report['deferred_repositories'])}")
+    if totals["deferred"]:
+        print(f"다음 실행으로 미룬 이슈: {totals['deferred']}개")
+    if report["requests"]["max_requests"]:
+        print(f"API 요청: {report['requests']['used']}/{report['requests']['max_requests']}개 사용")
+    print(f"생성됨: {totals['created']}개 / 업데이트됨: {totals['updated']}개 / "
+          f"실패: {totals['failed']}개 (총 {totals['total']}개)")
     print("=" * 70)
-
+    
+    if args.report:
+        write_run_report(args.report, report)
+    finish_tracing(tracer, profiler, args)
 
 if __name__ == "__main__":
     main()